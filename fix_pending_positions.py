@@ -153,14 +153,20 @@ def fix_mismatches(auto_fix=False):
     
     return len(fixes_applied)
 
-def main():
-    """Main function"""
+def main(argv=None):
+    """Main function; argv defaults to sys.argv so the menu can run it in-process"""
     import sys
+    if argv is None:
+        argv = sys.argv
     
     print("Fix Pending Positions Utility")
     print("Analyzes and fixes mismatches between IBKR positions and pending orders")
     print()
     
+    # The tracker singleton was loaded at import; when the menu runs us in-process
+    # other tools may have written the file since, so start from what is on disk
+    pending_tracker.pending_sales = pending_tracker.load_pending_sales()
+    
     # Analyze first
     mismatch_count = analyze_pending_vs_actual()
     
@@ -171,7 +177,7 @@ def main():
     print(f"\n⚠️  Found {mismatch_count} mismatches.")
     
     # Check if user wants to fix
-    if "--fix" in sys.argv or "--auto-fix" in sys.argv:
+    if "--fix" in argv or "--auto-fix" in argv:
         print("\nApplying fixes...")
         fixes_applied = fix_mismatches(auto_fix=True)
         print(f"\n✅ Applied {fixes_applied} fixes!")
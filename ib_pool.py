@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared IBKR Connection - one IB() socket per process, reused by every monitor dialog
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+try:
+    from ib_insync import IB, util
+    IB_AVAILABLE = True
+except ImportError:
+    IB_AVAILABLE = False
+
+# Monitors start searching above the trader's own client id so they never take it
+MONITOR_CLIENT_ID_OFFSET = 20
+MAX_CLIENT_ID_ATTEMPTS = 10
+# Short per attempt: a taken client id shows up as a timeout, not a refusal
+CONNECT_ATTEMPT_TIMEOUT = 4
+# TWS error code for "client id is already in use"
+CLIENT_ID_IN_USE = 326
+# How often a Qt event loop lets ib_insync read the socket and fire its events
+IB_PUMP_MS = 50
+
+_ib: Optional["IB"] = None
+
+def _load_connection_settings(config_path: str = "config.json"):
+    """Read host, port and base client id from config.json"""
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    except Exception:
+        config = {}
+
+    host = config.get("ib_host", "127.0.0.1")
+    port = int(config.get("ib_port", 7497))
+    base_client_id = int(config.get("ib_client_id", 1)) + MONITOR_CLIENT_ID_OFFSET
+    return host, port, base_client_id
+
+def _connect_with_free_client_id(host: str, port: int, base_client_id: int) -> "IB":
+    """
+    Connect using the first client id TWS accepts, trying ascending ids
+    
+    Only a taken client id (error 326) moves on to the next one; any other
+    failure, e.g. TWS waiting on its accept-connection prompt, is raised at once
+    instead of being retried for every id.
+    """
+    for client_id in range(base_client_id, base_client_id + MAX_CLIENT_ID_ATTEMPTS):
+        ib = IB()
+        error_codes = []
+        
+        def on_error(req_id, error_code, *args):
+            error_codes.append(error_code)
+        
+        ib.errorEvent += on_error
+        try:
+            ib.connect(host, port, clientId=client_id, timeout=CONNECT_ATTEMPT_TIMEOUT)
+            return ib
+        except (ConnectionError, TimeoutError, asyncio.TimeoutError) as e:
+            ib.disconnect()
+            # TWS reports a taken id with error 326 and then drops the socket, which
+            # ib_insync surfaces as a timeout waiting for the API handshake
+            if CLIENT_ID_IN_USE not in error_codes:
+                raise ConnectionError(f"Could not connect to {host}:{port} as client {client_id}: {e!r}") from e
+        finally:
+            ib.errorEvent -= on_error
+
+    raise ConnectionError(
+        f"Client ids {base_client_id}-{base_client_id + MAX_CLIENT_ID_ATTEMPTS - 1} are all in use"
+    )
+
+def get_ib() -> "IB":
+    """Return the process-wide IB connection, connecting on first use"""
+    global _ib
+    if not IB_AVAILABLE:
+        raise ImportError("ib-insync not installed")
+
+    if _ib is None or not _ib.isConnected():
+        host, port, base_client_id = _load_connection_settings()
+        _ib = _connect_with_free_client_id(host, port, base_client_id)
+    return _ib
+
+def create_ib_pump(parent: QObject) -> QTimer:
+    """
+    Timer giving ib_insync's asyncio loop one pass per tick on the creating thread
+    
+    ib_insync only reads the socket, updates its caches and fires events while
+    that loop runs, which a Qt event loop never does by itself. start() the
+    timer once connected and stop() it when done; the loop belongs to the
+    thread, so one pump serves every IB instance used there.
+    """
+    pump = QTimer(parent)
+    pump.setInterval(IB_PUMP_MS)
+    pump.timeout.connect(_run_ib_loop_once)
+    return pump
+
+def _run_ib_loop_once():
+    util.sleep(0)
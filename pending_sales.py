@@ -6,7 +6,8 @@ Pending Orders Tracker - Track our own buy/sell orders since IBKR API can't see
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 class PendingSalesTracker:
     """Track pending buy and sell orders in our own system"""
@@ -136,6 +137,12 @@ class PendingSalesTracker:
         """Get all pending orders (buys and sells)"""
         return self.pending_sales.copy()
     
+    def snapshot(self) -> Mapping[str, Tuple[Optional[str], Optional[int]]]:
+        """Get a read-only {symbol: (action, quantity)} view of all pending orders"""
+        return MappingProxyType({
+            k: (v.get('action'), v.get('quantity')) for k, v in self.pending_sales.items()
+        })
+    
     def clear_all_pending_sales(self):
         """Clear all pending orders (emergency reset)"""
         self.pending_sales = {}
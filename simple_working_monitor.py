@@ -3,19 +3,44 @@
 SIMPLE WORKING MONITOR - No complexity, just works
 """
 
-import json
-from datetime import datetime
+import logging
+import traceback
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QMetaObject, Q_ARG, pyqtSlot
+from PyQt6.QtGui import QBrush, QColor, QFont
 
 try:
-    from ib_insync import IB, Stock, MarketOrder
+    from ib_insync import Stock, MarketOrder
     IB_AVAILABLE = True
 except ImportError:
     IB_AVAILABLE = False
 
 from pending_sales import pending_tracker
+from ib_pool import get_ib, create_ib_pump
+
+logger = logging.getLogger(__name__)
+
+# ib_insync logs every API error/warning itself; the monitor reports what matters
+logging.getLogger('ib_insync').setLevel(logging.CRITICAL)
+
+class LogPaneHandler(logging.Handler):
+    """Forward one monitor's log records to its log pane, safely from any thread"""
+    
+    def __init__(self, monitor):
+        super().__init__()
+        self.monitor = monitor
+        self.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+        # The module logger is shared by every open monitor; keep only this one's lines
+        self.addFilter(lambda record: getattr(record, 'monitor', None) == id(monitor))
+    
+    def emit(self, record):
+        try:
+            line = self.format(record)
+            # AutoConnection: direct call on the GUI thread, queued from any other
+            QMetaObject.invokeMethod(self.monitor, "append_log_line",
+                                     Qt.ConnectionType.AutoConnection, Q_ARG(str, line))
+        except Exception:
+            self.handleError(record)
 
 class SimpleWorkingMonitor(QDialog):
     def __init__(self, parent=None):
@@ -24,8 +49,36 @@ class SimpleWorkingMonitor(QDialog):
         self.setGeometry(200, 200, 1000, 600)
         
         self.ib = None
+        
+        # Lets ib_insync fire orderStatusEvent while connected
+        self._ib_pump = create_ib_pump(self)
+        
+        # Status styling is shared by every row, build it once
+        self._brush_red = QBrush(QColor(255, 0, 0))
+        self._brush_blue = QBrush(QColor(0, 0, 255))
+        self._brush_white = QBrush(QColor(255, 255, 255))
+        self._brush_green = QBrush(QColor(0, 128, 0))
+        self._brush_none = QBrush()
+        self._bold_font = QFont("Arial", 12, QFont.Weight.Bold)
+        self._normal_font = QFont()
+        
         self.init_ui()
         
+        self._log_handler = LogPaneHandler(self)
+        logger.addHandler(self._log_handler)
+        # The pane shows INFO lines; only default to that when the application
+        # has not configured logging itself, so its level (e.g. DEBUG) wins
+        if logger.level == logging.NOTSET and not logging.getLogger().handlers:
+            logger.setLevel(logging.INFO)
+        
+    def done(self, result):
+        # Every way out (close button, Esc, accept/reject) ends here. The IB connection
+        # is shared, so stop pumping and listening but leave it open; a handler left on
+        # the shared logger would keep writing into this hidden (or deleted) dialog
+        self._detach_ib_events()
+        logger.removeHandler(self._log_handler)
+        super().done(result)
+        
     def init_ui(self):
         layout = QVBoxLayout(self)
         
@@ -71,9 +124,13 @@ class SimpleWorkingMonitor(QDialog):
         self.log.setReadOnly(True)
         layout.addWidget(self.log)
         
-    def log_msg(self, msg):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log.append(f"[{timestamp}] {msg}")
+    def log_msg(self, msg, *args):
+        """Log through the module logger; args are %-formatted only if INFO is enabled"""
+        logger.info(msg, *args, extra={'monitor': id(self)})
+
+    @pyqtSlot(str)
+    def append_log_line(self, line):
+        self.log.append(line)
         self.log.verticalScrollBar().setValue(self.log.verticalScrollBar().maximum())
 
     def connect_ibkr(self):
@@ -82,17 +139,15 @@ class SimpleWorkingMonitor(QDialog):
             return
             
         try:
-            with open("config.json", 'r') as f:
-                config = json.load(f)
-            
-            host = config.get("ib_host", "127.0.0.1")
-            port = int(config.get("ib_port", 7497))
-            client_id = int(config.get("ib_client_id", 1)) + 20  # Use +20 to avoid any conflicts
+            self.log_msg("Connecting to IBKR (shared connection)")
             
-            self.log_msg(f"Connecting to {host}:{port} with client ID {client_id}")
+            self.ib = get_ib()
+            self.log_msg("Using client ID %s", self.ib.client.clientId)
             
-            self.ib = IB()
-            self.ib.connect(host, port, clientId=client_id, timeout=10)
+            # Refresh when IB reports order changes instead of guessing when they settle
+            self.ib.newOrderEvent += self._on_order_event
+            self.ib.orderStatusEvent += self._on_order_event
+            self._ib_pump.start()
             
             if self.ib.isConnected():
                 self.status_label.setText("Connected")
@@ -106,11 +161,22 @@ class SimpleWorkingMonitor(QDialog):
                 self.log_msg("Connection failed")
                 
         except Exception as e:
-            self.log_msg(f"Connection error: {e}")
+            self.log_msg("Connection error: %s", e)
+
+    def _on_order_event(self, trade):
+        # Defer to the next Qt loop iteration so the refresh runs outside the IB callback
+        QTimer.singleShot(0, self.refresh_simple)
+
+    def _detach_ib_events(self):
+        self._ib_pump.stop()
+        if self.ib:
+            self.ib.newOrderEvent -= self._on_order_event
+            self.ib.orderStatusEvent -= self._on_order_event
 
     def disconnect_ibkr(self):
-        if self.ib and self.ib.isConnected():
-            self.ib.disconnect()
+        # The socket is shared with other monitors: stop listening, leave it open
+        self._detach_ib_events()
+        self.ib = None
         
         self.status_label.setText("Not Connected")
         self.status_label.setStyleSheet("color: red; font-weight: bold;")
@@ -119,6 +185,16 @@ class SimpleWorkingMonitor(QDialog):
         self.connect_btn.clicked.connect(self.connect_ibkr)
         self.log_msg("Disconnected")
 
+    def _cell(self, row, col, text):
+        """Reuse the existing item for a cell, creating it only the first time"""
+        item = self.table.item(row, col)
+        if item is None:
+            item = QTableWidgetItem(text)
+            self.table.setItem(row, col, item)
+        else:
+            item.setText(text)
+        return item
+
     def refresh_simple(self):
         """SIMPLE refresh - just show what we have"""
         try:
@@ -131,75 +207,65 @@ class SimpleWorkingMonitor(QDialog):
                 for item in portfolio:
                     if item.position != 0:
                         positions[item.contract.symbol] = int(item.position)
-                self.log_msg(f"IBKR positions: {positions}")
+                self.log_msg("IBKR positions: %s", positions)
             else:
                 self.log_msg("Not connected - showing pending orders only")
             
-            # Get pending orders
-            pending_sales = pending_tracker.get_all_pending_sales()
-            pending_buys = pending_tracker.get_all_pending_buys()
+            # Get pending orders - one snapshot, one lookup per symbol
+            pending = pending_tracker.snapshot()
             
-            self.log_msg(f"Pending sales: {list(pending_sales.keys())}")
-            self.log_msg(f"Pending buys: {list(pending_buys.keys())}")
+            self.log_msg("Pending sales: %s", [s for s, (action, _) in pending.items() if action == 'SELL'])
+            self.log_msg("Pending buys: %s", [s for s, (action, _) in pending.items() if action == 'BUY'])
             
             # Combine all symbols
-            all_symbols = set(positions.keys())
-            all_symbols.update(pending_sales.keys())
-            all_symbols.update(pending_buys.keys())
+            all_symbols = positions.keys() | pending.keys()
             
-            self.log_msg(f"All symbols to show: {sorted(all_symbols)}")
+            self.log_msg("All symbols to show: %s", sorted(all_symbols))
             
             # Update table
             self.table.setRowCount(len(all_symbols))
             
             for row, symbol in enumerate(sorted(all_symbols)):
-                self.log_msg(f"Processing row {row}: {symbol}")
+                self.log_msg("Processing row %d: %s", row, symbol)
+                action, qty = pending.get(symbol, (None, 0))
                 
                 # Symbol
-                self.table.setItem(row, 0, QTableWidgetItem(symbol))
+                self._cell(row, 0, symbol)
                 
                 # Position
                 pos_qty = positions.get(symbol, 0)
-                self.table.setItem(row, 1, QTableWidgetItem(str(pos_qty)))
+                self._cell(row, 1, str(pos_qty))
                 
                 # Orders
-                orders_text = []
-                if symbol in pending_sales:
-                    qty = pending_sales[symbol]['quantity']
-                    orders_text.append(f"SELL {qty}")
-                if symbol in pending_buys:
-                    qty = pending_buys[symbol]['quantity']
-                    orders_text.append(f"BUY {qty}")
-                
-                orders_str = ", ".join(orders_text) if orders_text else "None"
-                self.table.setItem(row, 2, QTableWidgetItem(orders_str))
+                orders_str = f"{action} {qty}" if action in ('SELL', 'BUY') else "None"
+                self._cell(row, 2, orders_str)
                 
                 # STATUS - THE IMPORTANT PART
-                if symbol in pending_sales:
-                    status_item = QTableWidgetItem("PENDING SALE")
-                    status_item.setBackground(QColor("red"))
-                    status_item.setForeground(QColor("white"))
-                    status_item.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                    self.log_msg(f"Set PENDING SALE status for {symbol}")
-                elif symbol in pending_buys:
-                    status_item = QTableWidgetItem("PENDING BUY")
-                    status_item.setBackground(QColor("blue"))
-                    status_item.setForeground(QColor("white"))
-                    status_item.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                    self.log_msg(f"Set PENDING BUY status for {symbol}")
+                if action == 'SELL':
+                    status_item = self._cell(row, 3, "PENDING SALE")
+                    status_item.setBackground(self._brush_red)
+                    status_item.setForeground(self._brush_white)
+                    status_item.setFont(self._bold_font)
+                    self.log_msg("Set PENDING SALE status for %s", symbol)
+                elif action == 'BUY':
+                    status_item = self._cell(row, 3, "PENDING BUY")
+                    status_item.setBackground(self._brush_blue)
+                    status_item.setForeground(self._brush_white)
+                    status_item.setFont(self._bold_font)
+                    self.log_msg("Set PENDING BUY status for %s", symbol)
                 else:
-                    status_item = QTableWidgetItem("Open")
-                    status_item.setForeground(QColor("green"))
-                    self.log_msg(f"Set Open status for {symbol}")
-                    
-                self.table.setItem(row, 3, status_item)
+                    status_item = self._cell(row, 3, "Open")
+                    status_item.setBackground(self._brush_none)
+                    status_item.setForeground(self._brush_green)
+                    status_item.setFont(self._normal_font)
+                    self.log_msg("Set Open status for %s", symbol)
             
-            self.log_msg(f"=== REFRESH COMPLETE: {len(all_symbols)} symbols ===")
+            self.log_msg("=== REFRESH COMPLETE: %d symbols ===", len(all_symbols))
             
-        except Exception as e:
-            self.log_msg(f"Refresh error: {e}")
-            import traceback
-            self.log_msg(traceback.format_exc())
+        except (AttributeError, KeyError, ConnectionError) as e:
+            self.log_msg("Refresh error: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                self.log_msg(traceback.format_exc())
     
     def add_buy_order(self):
         """Add buy order"""
@@ -224,11 +290,10 @@ class SimpleWorkingMonitor(QDialog):
             # Track it
             pending_tracker.mark_as_pending_buy(symbol.upper(), qty, "MARKET", notes="Manual buy")
             
-            self.log_msg(f"Buy order placed: {qty} shares of {symbol}")
-            QTimer.singleShot(1000, self.refresh_simple)
+            self.log_msg("Buy order placed: %d shares of %s", qty, symbol)
             
         except Exception as e:
-            self.log_msg(f"Buy order error: {e}")
+            self.log_msg("Buy order error: %s", e)
 
 if __name__ == "__main__":
     app = QApplication([])
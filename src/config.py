@@ -4,7 +4,7 @@ Loads settings from environment variables with sensible defaults.
 """
 
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import List, Optional
 from dotenv import load_dotenv
@@ -72,6 +72,19 @@ class Config:
         except ValueError:
             return 1.0
     
+    @property
+    def history_cache_ttl(self) -> float:
+        """Get how long a downloaded price history is reused from disk, in seconds."""
+        try:
+            return float(os.getenv('HISTORY_CACHE_TTL', '3600'))
+        except ValueError:
+            return 3600.0
+    
+    @property
+    def history_cache_dir(self) -> Path:
+        """Get directory for cached price histories."""
+        return self.project_root / '.cache' / 'history'
+    
     @property
     def today_output_dir(self) -> Path:
         """Get today's output directory."""
@@ -91,10 +104,15 @@ class Config:
         if not self.tickers:
             issues.append("No tickers specified")
         
+        # fromisoformat also takes other ISO 8601 forms (2025-W01-1, 20250101) on
+        # Python 3.11+, so check the YYYY-MM-DD shape first
+        start_date = self.start_date
         try:
-            datetime.strptime(self.start_date, '%Y-%m-%d')
+            if not (len(start_date) == 10 and start_date[4] == start_date[7] == '-'):
+                raise ValueError(start_date)
+            date.fromisoformat(start_date)
         except ValueError:
-            issues.append(f"Invalid start_date format: {self.start_date}")
+            issues.append(f"Invalid start_date format: {start_date}")
         
         if self.max_retries < 0:
             issues.append("max_retries must be non-negative")
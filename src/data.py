@@ -3,8 +3,11 @@ Data fetching module for Weekly Stocks project.
 Handles stock data retrieval with retry logic and error handling.
 """
 
+import copy
 import logging
+import math
 import time
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import yfinance as yf
@@ -14,37 +17,118 @@ from .config import config
 
 logger = logging.getLogger(__name__)
 
+class WelfordAccumulator:
+    """Running mean, variance, min and max of a stream using Welford's algorithm."""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+    
+    def push(self, x: float) -> None:
+        """Add one observation; NaN values are ignored like pandas reductions do."""
+        if math.isnan(x):
+            return
+        
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        
+        if self.count == 1:
+            self.min = self.max = x
+        else:
+            self.min = min(self.min, x)
+            self.max = max(self.max, x)
+    
+    @property
+    def average(self) -> float:
+        """Mean of the observations, NaN when there are none."""
+        return self.mean if self.count else math.nan
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), matching pandas Series.std."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
 class StockDataFetcher:
     """Handles fetching and processing stock data."""
     
     def __init__(self):
         self.failed_tickers = []
         self.successful_tickers = []
+        # Per-ticker running Weekly_Return statistics of closed weeks and the
+        # (first week, last closed week) they cover; the last closed week is None
+        # while the history is a single week
+        self.return_stats: Dict[str, WelfordAccumulator] = {}
+        self._return_stats_span: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]] = {}
+    
+    def _history_cache_path(self, ticker: str, start: str, end: str) -> Path:
+        """Location of the cached daily history for one ticker and date window."""
+        return config.history_cache_dir / f"{ticker}_{start}_{end}.pkl"
+    
+    def _load_cached_history(self, ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
+        """Return the cached history for this window if it is younger than the TTL."""
+        path = self._history_cache_path(ticker, start, end)
+        try:
+            if time.time() - path.stat().st_mtime >= config.history_cache_ttl:
+                return None
+            return pd.read_pickle(path)
+        except Exception:
+            # Missing or unreadable entries are simply fetched again
+            return None
+    
+    def _store_cached_history(self, ticker: str, start: str, end: str, data: pd.DataFrame) -> None:
+        """Save a fetched history, dropping this ticker's entries for older windows."""
+        if config.history_cache_ttl <= 0:
+            return
+        
+        path = self._history_cache_path(ticker, start, end)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in path.parent.glob(f"{ticker}_*.pkl"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            data.to_pickle(path)
+        except OSError as e:
+            logger.debug("Could not cache history for %s: %s", ticker, e)
     
     def fetch_ticker_data(self, ticker: str) -> Optional[pd.DataFrame]:
         """
         Fetch data for a single ticker with retry logic.
         
+        Reruns within HISTORY_CACHE_TTL seconds reuse the history saved on disk
+        for the same date window instead of downloading it again.
+        
         Args:
             ticker: Stock ticker symbol
             
         Returns:
             DataFrame with stock data or None if failed
         """
+        start_date, end_date = config.start_date, config.end_date
+        
+        cached = self._load_cached_history(ticker, start_date, end_date)
+        if cached is not None:
+            logger.debug("Using cached data for %s (%d rows)", ticker, len(cached))
+            return cached
+        
         for attempt in range(config.max_retries + 1):
             try:
-                logger.debug(f"Fetching data for {ticker} (attempt {attempt + 1})")
+                logger.debug("Fetching data for %s (attempt %d)", ticker, attempt + 1)
                 
                 # Create yfinance ticker object
                 stock = yf.Ticker(ticker)
                 
                 # Fetch historical data
                 data = stock.history(
-                    start=config.start_date,
-                    end=config.end_date,
+                    start=start_date,
+                    end=end_date,
                     interval='1d',
                     auto_adjust=True,
-                    prepost=True
+                    actions=False
                 )
                 
                 if data.empty:
@@ -57,7 +141,9 @@ class StockDataFetcher:
                 # Reset index to make Date a column
                 data = data.reset_index()
                 
-                logger.debug(f"Successfully fetched {len(data)} rows for {ticker}")
+                self._store_cached_history(ticker, start_date, end_date, data)
+                
+                logger.debug("Successfully fetched %d rows for %s", len(data), ticker)
                 return data
                 
             except Exception as e:
@@ -166,6 +252,52 @@ class StockDataFetcher:
         
         return combined_data, status
     
+    def update_return_stats(self, ticker: str, ticker_data: pd.DataFrame) -> WelfordAccumulator:
+        """
+        Push weekly returns not seen before into the ticker's running statistics.
+        
+        Only closed weeks (all but the last row) are accumulated: the last week
+        may still be in progress, and a re-fetch updates its return under the
+        same W-FRI label. Its return is added to a copy on every call instead,
+        so repeated calls on a growing history cost O(new weeks). If the history
+        no longer starts on the same week or has shrunk (e.g. a different date
+        range), the accumulator is rebuilt from scratch.
+        
+        Args:
+            ticker: Stock ticker symbol
+            ticker_data: Weekly data for this ticker, sorted by Date
+            
+        Returns:
+            A WelfordAccumulator over every week in ticker_data
+        """
+        first_date = ticker_data['Date'].iloc[0]
+        closed = ticker_data.iloc[:-1]
+        closed_through = closed['Date'].iloc[-1] if len(closed) else None
+        
+        acc = self.return_stats.get(ticker)
+        span = self._return_stats_span.get(ticker)
+        
+        if acc is None or span[0] != first_date or (
+            span[1] is not None and (closed_through is None or closed_through < span[1])
+        ):
+            acc = WelfordAccumulator()
+            span = (first_date, None)
+        
+        if span[1] is None:
+            new_returns = closed['Weekly_Return']
+        else:
+            new_returns = closed.loc[closed['Date'] > span[1], 'Weekly_Return']
+        
+        for weekly_return in new_returns.to_numpy(dtype=float):
+            acc.push(weekly_return)
+        
+        self.return_stats[ticker] = acc
+        self._return_stats_span[ticker] = (first_date, closed_through)
+        
+        stats = copy.copy(acc)
+        stats.push(float(ticker_data['Weekly_Return'].iloc[-1]))
+        return stats
+    
     def get_summary_stats(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate summary statistics for each ticker.
@@ -187,6 +319,9 @@ class StockDataFetcher:
             if ticker_data.empty:
                 continue
             
+            # Weekly return statistics are maintained incrementally
+            return_stats = self.update_return_stats(ticker, ticker_data)
+            
             # Calculate statistics
             latest_price = ticker_data['Close'].iloc[-1]
             first_price = ticker_data['Close'].iloc[0]
@@ -200,10 +335,10 @@ class StockDataFetcher:
                 'First_Price': round(first_price, 2),
                 'Latest_Price': round(latest_price, 2),
                 'Total_Return_Pct': round(total_return, 2),
-                'Avg_Weekly_Return_Pct': round(ticker_data['Weekly_Return'].mean(), 2),
-                'Weekly_Volatility_Pct': round(ticker_data['Weekly_Return'].std(), 2),
-                'Max_Weekly_Gain_Pct': round(ticker_data['Weekly_Return'].max(), 2),
-                'Max_Weekly_Loss_Pct': round(ticker_data['Weekly_Return'].min(), 2),
+                'Avg_Weekly_Return_Pct': round(return_stats.average, 2),
+                'Weekly_Volatility_Pct': round(return_stats.std, 2),
+                'Max_Weekly_Gain_Pct': round(return_stats.max, 2),
+                'Max_Weekly_Loss_Pct': round(return_stats.min, 2),
                 'Avg_Volume': int(ticker_data['Volume'].mean())
             }
             
@@ -3,56 +3,106 @@ Report generation module for Weekly Stocks project.
 Creates CSV and HTML reports from stock data.
 """
 
+import io
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
 
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+CSV_WRITE_BUFFER = 1 << 20  # 1 MiB
+
+def write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write a DataFrame to CSV without the index, formatted in memory and written in one call."""
+    # The index is not written anyway, and a MultiIndex sends to_csv down a much slower path
+    if isinstance(df.index, pd.MultiIndex):
+        df = df.reset_index(drop=True)
+    
+    # Format in memory, then hand the file a single large write
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    data = buf.getvalue().encode('utf-8')
+    with open(path, 'wb', buffering=CSV_WRITE_BUFFER) as f:
+        f.write(data)
+
+def write_file(path: Path, data: bytes) -> None:
+    """Write bytes to path with raw os.write calls (the GIL is released for each whole syscall)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 class ReportGenerator:
     """Handles generation of CSV and HTML reports."""
     
     def __init__(self):
-        # Set up Jinja2 environment
+        # Set up Jinja2 environment; compiled templates are cached on disk across runs
         template_dir = config.project_root / 'templates'
+        bytecode_dir = config.project_root / '.cache' / 'jinja'
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
         self.jinja_env = Environment(
             loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+            auto_reload=False
         )
+        self._report_template = None
+    
+    @property
+    def report_template(self) -> Template:
+        """Get the compiled report template, loading it on first use."""
+        if self._report_template is None:
+            self._report_template = self.jinja_env.get_template('report.html')
+        return self._report_template
     
-    def save_csv_reports(self, weekly_data: pd.DataFrame, summary_stats: pd.DataFrame) -> Dict[str, Path]:
+    def save_csv_reports(
+        self, 
+        weekly_data: pd.DataFrame, 
+        summary_stats: pd.DataFrame, 
+        output_dir: Optional[Path] = None
+    ) -> Dict[str, Path]:
         """
         Save CSV reports to the output directory.
         
         Args:
             weekly_data: Weekly stock data DataFrame
             summary_stats: Summary statistics DataFrame
+            output_dir: Directory to write to (default: config.today_output_dir)
             
         Returns:
             Dictionary with paths to saved files
         """
-        output_dir = config.today_output_dir
+        if output_dir is None:
+            output_dir = config.today_output_dir
         saved_files = {}
         
+        # (key, frame, path, label) for each non-empty report
+        jobs = []
+        if not weekly_data.empty:
+            jobs.append(('weekly_data', weekly_data, output_dir / 'weekly_data.csv', 'weekly data'))
+        if not summary_stats.empty:
+            jobs.append(('summary_stats', summary_stats, output_dir / 'summary_stats.csv', 'summary stats'))
+        
         try:
-            # Save weekly data
-            if not weekly_data.empty:
-                weekly_csv_path = output_dir / 'weekly_data.csv'
-                weekly_data.to_csv(weekly_csv_path, index=False)
-                saved_files['weekly_data'] = weekly_csv_path
-                logger.info(f"Saved weekly data CSV: {weekly_csv_path}")
-            
-            # Save summary statistics
-            if not summary_stats.empty:
-                summary_csv_path = output_dir / 'summary_stats.csv'
-                summary_stats.to_csv(summary_csv_path, index=False)
-                saved_files['summary_stats'] = summary_csv_path
-                logger.info(f"Saved summary stats CSV: {summary_csv_path}")
+            # The frames are independent and the writers release the GIL, so write them concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [(key, path, label, pool.submit(write_csv, df, path)) for key, df, path, label in jobs]
+            
+            for key, path, label, future in futures:
+                future.result()
+                saved_files[key] = path
+                logger.info(f"Saved {label} CSV: {path}")
             
         except Exception as e:
             logger.error(f"Error saving CSV reports: {e}")
@@ -64,8 +114,11 @@ class ReportGenerator:
         self, 
         weekly_data: pd.DataFrame, 
         summary_stats: pd.DataFrame, 
-        status: Dict[str, Any]
-    ) -> Path:
+        status: Dict[str, Any],
+        output_dir: Optional[Path] = None,
+        date_range: Optional[Tuple[str, str]] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[Path]:
         """
         Generate HTML report using Jinja2 template.
         
@@ -73,23 +126,39 @@ class ReportGenerator:
             weekly_data: Weekly stock data DataFrame
             summary_stats: Summary statistics DataFrame
             status: Status information from data fetching
+            output_dir: Directory to write to (default: config.today_output_dir)
+            date_range: (start_date, end_date) to report (default: from config)
+            now: Report timestamp (default: current time)
             
         Returns:
-            Path to generated HTML file
+            Path to generated HTML file, or None if there was no data to report
         """
+        if weekly_data.empty and summary_stats.empty:
+            logger.warning("No data to report, skipping HTML report")
+            return None
+        
+        if output_dir is None:
+            output_dir = config.today_output_dir
+        start_date, end_date = date_range or (config.start_date, config.end_date)
+        
         try:
             # Load template
-            template = self.jinja_env.get_template('report.html')
+            template = self.report_template
+            
+            # Pre-render tables in pandas so the template never iterates rows itself
+            weekly_table = weekly_data.to_html(index=False, border=0, classes='data')
+            summary_table = summary_stats.to_html(index=False, border=0, classes='data')
             
             # Prepare template context
-            now = datetime.now()
+            if now is None:
+                now = datetime.now()
             context = {
                 'report_date': now.strftime('%Y-%m-%d'),
                 'report_time': now.strftime('%H:%M:%S'),
-                'start_date': config.start_date,
-                'end_date': config.end_date,
-                'weekly_data': weekly_data,
-                'summary_stats': summary_stats,
+                'start_date': start_date,
+                'end_date': end_date,
+                'weekly_table': weekly_table,
+                'summary_table': summary_table,
                 'status': status,
                 'config': config
             }
@@ -98,9 +167,8 @@ class ReportGenerator:
             html_content = template.render(**context)
             
             # Save HTML file
-            html_path = config.today_output_dir / 'weekly_stocks_report.html'
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            html_path = output_dir / 'weekly_stocks_report.html'
+            write_file(html_path, html_content.encode('utf-8'))
             
             logger.info(f"Generated HTML report: {html_path}")
             return html_path
@@ -109,13 +177,19 @@ class ReportGenerator:
             logger.error(f"Error generating HTML report: {e}")
             raise
     
-    def create_summary_text(self, summary_stats: pd.DataFrame, status: Dict[str, Any]) -> str:
+    def create_summary_text(
+        self, 
+        summary_stats: pd.DataFrame, 
+        status: Dict[str, Any], 
+        date_range: Optional[Tuple[str, str]] = None
+    ) -> str:
         """
         Create a text summary of the analysis.
         
         Args:
             summary_stats: Summary statistics DataFrame
             status: Status information from data fetching
+            date_range: (start_date, end_date) to report (default: from config)
             
         Returns:
             Text summary string
@@ -123,54 +197,66 @@ class ReportGenerator:
         if summary_stats.empty:
             return "No data available for summary."
         
-        # Calculate overall statistics
-        avg_return = summary_stats['Total_Return_Pct'].mean()
-        best_performer = summary_stats.iloc[0]  # Already sorted by total return
-        worst_performer = summary_stats.iloc[-1]
-        
-        summary_lines = [
-            f"Weekly Stocks Analysis Summary",
-            f"=" * 40,
-            f"Data Period: {config.start_date} to {config.end_date}",
-            f"Stocks Analyzed: {status['total_successful']}/{status['total_requested']}",
-            "",
-            f"Overall Performance:",
-            f"  Average Total Return: {avg_return:.2f}%",
-            f"  Best Performer: {best_performer['Ticker']} ({best_performer['Total_Return_Pct']:.2f}%)",
-            f"  Worst Performer: {worst_performer['Ticker']} ({worst_performer['Total_Return_Pct']:.2f}%)",
-            "",
-            f"Top 5 Performers:",
-        ]
-        
-        # Add top 5 performers
-        for i, row in summary_stats.head(5).iterrows():
-            summary_lines.append(f"  {i+1}. {row['Ticker']}: {row['Total_Return_Pct']:.2f}%")
-        
-        if status['failed']:
-            summary_lines.extend([
-                "",
-                f"Failed to fetch data for: {', '.join(status['failed'])}"
-            ])
-        
-        return "\n".join(summary_lines)
+        start_date, end_date = date_range or (config.start_date, config.end_date)
+        
+        # Pull the two columns out once; rows are already sorted by total return
+        returns = summary_stats['Total_Return_Pct'].to_numpy(dtype=float)
+        tickers = summary_stats['Ticker'].to_numpy()
+        
+        # Calculate overall statistics (nanmean skips NaN like Series.mean)
+        avg_return = np.nanmean(returns)
+        best, worst = 0, len(returns) - 1
+        
+        def lines():
+            yield "Weekly Stocks Analysis Summary"
+            yield "=" * 40
+            yield f"Data Period: {start_date} to {end_date}"
+            yield f"Stocks Analyzed: {status['total_successful']}/{status['total_requested']}"
+            yield ""
+            yield "Overall Performance:"
+            yield f"  Average Total Return: {avg_return:.2f}%"
+            yield f"  Best Performer: {tickers[best]} ({returns[best]:.2f}%)"
+            yield f"  Worst Performer: {tickers[worst]} ({returns[worst]:.2f}%)"
+            yield ""
+            yield "Top 5 Performers:"
+            
+            # Add top 5 performers
+            for i in range(min(5, len(returns))):
+                yield f"  {i+1}. {tickers[i]}: {returns[i]:.2f}%"
+            
+            if status['failed']:
+                yield ""
+                yield f"Failed to fetch data for: {', '.join(status['failed'])}"
+        
+        return "\n".join(lines())
     
-    def save_summary_text(self, summary_stats: pd.DataFrame, status: Dict[str, Any]) -> Path:
+    def save_summary_text(
+        self, 
+        summary_stats: pd.DataFrame, 
+        status: Dict[str, Any], 
+        output_dir: Optional[Path] = None, 
+        date_range: Optional[Tuple[str, str]] = None
+    ) -> Path:
         """
         Save text summary to file.
         
         Args:
             summary_stats: Summary statistics DataFrame
             status: Status information from data fetching
+            output_dir: Directory to write to (default: config.today_output_dir)
+            date_range: (start_date, end_date) to report (default: from config)
             
         Returns:
             Path to saved text file
         """
+        if output_dir is None:
+            output_dir = config.today_output_dir
+        
         try:
-            summary_text = self.create_summary_text(summary_stats, status)
-            summary_path = config.today_output_dir / 'summary.txt'
+            summary_text = self.create_summary_text(summary_stats, status, date_range)
+            summary_path = output_dir / 'summary.txt'
             
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                f.write(summary_text)
+            write_file(summary_path, summary_text.encode('utf-8'))
             
             logger.info(f"Saved text summary: {summary_path}")
             return summary_path
@@ -198,20 +284,29 @@ class ReportGenerator:
         """
         logger.info("Generating all reports...")
         
-        all_files = {}
+        # Resolve config-derived values once for every report
+        output_dir = config.today_output_dir
+        date_range = (config.start_date, config.end_date)
+        now = datetime.now()
         
-        # Generate CSV reports
-        csv_files = self.save_csv_reports(weekly_data, summary_stats)
-        all_files.update(csv_files)
+        all_files = {}
         
-        # Generate HTML report
-        html_file = self.generate_html_report(weekly_data, summary_stats, status)
-        all_files['html_report'] = html_file
+        # Issue the HTML and text writes alongside the CSV writes rather than one after another
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            html_future = pool.submit(
+                self.generate_html_report, weekly_data, summary_stats, status, output_dir, date_range, now
+            )
+            text_future = pool.submit(self.save_summary_text, summary_stats, status, output_dir, date_range)
+            
+            # Generate CSV reports
+            csv_files = self.save_csv_reports(weekly_data, summary_stats, output_dir)
         
-        # Generate text summary
-        text_file = self.save_summary_text(summary_stats, status)
-        all_files['text_summary'] = text_file
+        all_files.update(csv_files)
+        html_file = html_future.result()
+        if html_file is not None:
+            all_files['html_report'] = html_file
+        all_files['text_summary'] = text_future.result()
         
-        logger.info(f"Generated {len(all_files)} report files in {config.today_output_dir}")
+        logger.info(f"Generated {len(all_files)} report files in {output_dir}")
         
         return all_files
@@ -0,0 +1,19 @@
+"""
+Tests for configuration validation in src.config.
+"""
+
+import pytest
+
+from src.config import config
+
+
+@pytest.mark.parametrize('start_date', ['2025-01-06', '2024-02-29'])
+def test_valid_start_date(monkeypatch, start_date):
+    monkeypatch.setenv('START_DATE', start_date)
+    assert not [issue for issue in config.validate() if 'start_date' in issue]
+
+
+@pytest.mark.parametrize('start_date', ['2025-W01-1', '20250101', '2025-13-01', '2025-02-30', '2025/01/06'])
+def test_invalid_start_date(monkeypatch, start_date):
+    monkeypatch.setenv('START_DATE', start_date)
+    assert f"Invalid start_date format: {start_date}" in config.validate()
@@ -0,0 +1,129 @@
+"""
+Tests for the history cache and incremental weekly return statistics in src.data.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+import src.data as data_module
+from src.data import StockDataFetcher, WelfordAccumulator
+
+
+def weekly_frame(closes, start='2025-01-03'):
+    """Weekly rows labelled W-FRI with Weekly_Return computed like fetch_ticker_data."""
+    df = pd.DataFrame({
+        'Date': pd.date_range(start, periods=len(closes), freq='W-FRI'),
+        'Close': closes,
+    })
+    df['Weekly_Return'] = df['Close'].pct_change() * 100
+    return df
+
+
+def assert_matches_pandas(acc, df):
+    returns = df['Weekly_Return']
+    assert acc.count == returns.count()
+    assert acc.average == pytest.approx(returns.mean(), nan_ok=True)
+    assert acc.std == pytest.approx(returns.std(), nan_ok=True)
+    assert acc.min == pytest.approx(returns.min(), nan_ok=True)
+    assert acc.max == pytest.approx(returns.max(), nan_ok=True)
+
+
+def test_welford_matches_pandas_reductions():
+    returns = pd.Series([math.nan, 1.5, -2.0, 0.25, 3.0, -0.75])
+    acc = WelfordAccumulator()
+    for x in returns:
+        acc.push(x)
+
+    assert acc.count == returns.count()
+    assert acc.average == pytest.approx(returns.mean())
+    assert acc.std == pytest.approx(returns.std())
+    assert acc.min == returns.min()
+    assert acc.max == returns.max()
+
+
+def test_refetched_partial_week_is_not_stale():
+    fetcher = StockDataFetcher()
+
+    # The last week is still in progress when first fetched ...
+    df = weekly_frame([100.0, 102.0, 101.0, 90.0])
+    assert_matches_pandas(fetcher.update_return_stats('AAA', df), df)
+
+    # ... and is re-fetched under the same label with a different close
+    df = weekly_frame([100.0, 102.0, 101.0, 120.0])
+    assert_matches_pandas(fetcher.update_return_stats('AAA', df), df)
+
+    # Then it closes and a new week starts
+    df = weekly_frame([100.0, 102.0, 101.0, 118.0, 119.0])
+    assert_matches_pandas(fetcher.update_return_stats('AAA', df), df)
+
+
+def test_history_change_rebuilds_stats():
+    fetcher = StockDataFetcher()
+    fetcher.update_return_stats('AAA', weekly_frame([100.0, 105.0, 95.0, 99.0]))
+
+    shorter = weekly_frame([100.0, 104.0])
+    assert_matches_pandas(fetcher.update_return_stats('AAA', shorter), shorter)
+
+    later_start = weekly_frame([50.0, 55.0, 52.0], start='2025-03-07')
+    assert_matches_pandas(fetcher.update_return_stats('AAA', later_start), later_start)
+
+
+def test_single_week_history():
+    fetcher = StockDataFetcher()
+    df = weekly_frame([100.0])
+    acc = fetcher.update_return_stats('AAA', df)
+    assert acc.count == 0
+    assert math.isnan(acc.average)
+
+    df = weekly_frame([100.0, 110.0])
+    assert_matches_pandas(fetcher.update_return_stats('AAA', df), df)
+
+
+class FakeTicker:
+    """Stands in for yf.Ticker, counting history downloads."""
+    calls = 0
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, start, end, **kwargs):
+        FakeTicker.calls += 1
+        index = pd.date_range(start, end, freq='B', inclusive='left', name='Date')
+        return pd.DataFrame({'Close': range(len(index))}, index=index, dtype=float)
+
+
+@pytest.fixture
+def fake_yfinance(monkeypatch, tmp_path):
+    monkeypatch.setattr(data_module.yf, 'Ticker', FakeTicker)
+    monkeypatch.setattr(data_module.config, 'project_root', tmp_path)
+    monkeypatch.setenv('START_DATE', '2025-01-06')
+    FakeTicker.calls = 0
+    return tmp_path
+
+
+def test_history_is_reused_from_disk_within_ttl(fake_yfinance):
+    first = StockDataFetcher().fetch_ticker_data('AAA')
+    second = StockDataFetcher().fetch_ticker_data('AAA')
+
+    assert FakeTicker.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert (first['Ticker'] == 'AAA').all()
+
+
+def test_expired_history_is_fetched_again(fake_yfinance, monkeypatch):
+    monkeypatch.setenv('HISTORY_CACHE_TTL', '0')
+    StockDataFetcher().fetch_ticker_data('AAA')
+    StockDataFetcher().fetch_ticker_data('AAA')
+
+    assert FakeTicker.calls == 2
+
+
+def test_new_window_replaces_older_cache_entries(fake_yfinance, monkeypatch):
+    StockDataFetcher().fetch_ticker_data('AAA')
+    monkeypatch.setenv('START_DATE', '2025-02-03')
+    StockDataFetcher().fetch_ticker_data('AAA')
+
+    cached = list((fake_yfinance / '.cache' / 'history').glob('AAA_*.pkl'))
+    assert [p.name.split('_')[1] for p in cached] == ['2025-02-03']
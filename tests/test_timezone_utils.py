@@ -0,0 +1,76 @@
+"""
+Tests that the vectorized timezone formatter matches the scalar one.
+"""
+
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+import timezone_utils as tu
+
+FORMAT_TYPES = ["full", "short", "time_only", "date_only"]
+
+# Ordinary times, the fall-back hour that occurs twice and a time inside the spring-forward gap
+WALL_TIMES = ["2025-06-01 12:00:00", "2025-01-15 23:59:59", "2025-11-02 01:30:00", "2025-03-09 02:30:00"]
+
+
+@pytest.fixture(params=[True, False], ids=["dual", "single"])
+def show_dual_time(request, monkeypatch):
+    display = {
+        "primary": "America/New_York",
+        "secondary": "Australia/Melbourne",
+        "show_dual_time": request.param,
+        "include_market_status": True,
+    }
+    monkeypatch.setattr(tu, "load_timezone_config", lambda: display)
+    tu.get_timezone_objects.cache_clear()
+    yield request.param
+    tu.get_timezone_objects.cache_clear()
+
+
+def scalar(timestamp, format_type):
+    return tu.format_dual_timezone(timestamp, include_market_status=False, format_type=format_type)
+
+
+@pytest.mark.parametrize("format_type", FORMAT_TYPES)
+def test_naive_series_matches_scalar(show_dual_time, format_type):
+    series = pd.Series(pd.to_datetime(WALL_TIMES[:3]))
+    expected = [scalar(dt.datetime.fromisoformat(t), format_type) for t in WALL_TIMES[:3]]
+    assert list(tu.format_dual_timezone_series(series, format_type)) == expected
+
+
+@pytest.mark.parametrize("format_type", FORMAT_TYPES)
+def test_aware_series_matches_scalar(show_dual_time, format_type):
+    series = pd.Series(pd.to_datetime(WALL_TIMES)).dt.tz_localize("UTC")
+    expected = [scalar(t.to_pydatetime(), format_type) for t in series]
+    assert list(tu.format_dual_timezone_series(series, format_type)) == expected
+
+
+def test_ambiguous_hour_is_first_occurrence(show_dual_time):
+    series = pd.Series(pd.to_datetime(["2025-11-02 01:30:00"]))
+    formatted = tu.format_dual_timezone_series(series).iloc[0]
+    assert formatted == scalar(dt.datetime(2025, 11, 2, 1, 30), "full")
+    assert formatted.startswith("2025-11-02 01:30:00 EDT" if show_dual_time else "2025-11-02 01:30:00 ET")
+
+
+def test_spring_forward_gap_is_same_instant_as_scalar(show_dual_time):
+    # replace(tzinfo=...) keeps the pre-transition offset (02:30 EST); the Series shows
+    # that instant normalized, as the scalar does for the same aware time
+    series = pd.Series(pd.to_datetime(["2025-03-09 02:30:00"]))
+    instant = dt.datetime(2025, 3, 9, 2, 30, tzinfo=tu.NY).astimezone(dt.timezone.utc)
+    assert tu.format_dual_timezone_series(series).iloc[0] == scalar(instant, "full")
+    assert tu.format_dual_timezone_series(series, "time_only").iloc[0].startswith("03:30:00")
+
+
+def test_nat_stays_missing(show_dual_time):
+    series = pd.Series(pd.to_datetime(["2025-06-01 12:00:00", None, "2025-11-02 01:30:00"]))
+    formatted = tu.format_dual_timezone_series(series)
+    assert formatted.isna().tolist() == [False, True, False]
+    assert formatted.iloc[2] == scalar(dt.datetime(2025, 11, 2, 1, 30), "full")
+
+
+@pytest.mark.parametrize("show_dual_time", [False], indirect=True)
+def test_single_timezone_date_only_has_no_suffix(show_dual_time):
+    series = pd.Series(pd.to_datetime(["2025-06-01 12:00:00"]))
+    assert tu.format_dual_timezone_series(series, "date_only").iloc[0] == "2025-06-01"
@@ -7,17 +7,22 @@ NY market time and user's local time (default: Melbourne) for easy coordination.
 """
 
 import datetime as dt
-import pytz
-from typing import Tuple, Optional
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from typing import Tuple, Optional, TYPE_CHECKING
 from pathlib import Path
 import json
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Standard timezone objects
-NY = pytz.timezone("America/New_York")
-MELBOURNE = pytz.timezone("Australia/Melbourne")
+NY = ZoneInfo("America/New_York")
+MELBOURNE = ZoneInfo("Australia/Melbourne")
 
+@lru_cache(maxsize=1)
 def load_timezone_config() -> dict:
-    """Load timezone configuration from config.json"""
+    """Load timezone configuration from config.json (read once per process; treat as read-only)"""
     try:
         base_dir = Path(__file__).resolve().parent
         with open(base_dir / "config.json", 'r') as f:
@@ -37,34 +42,41 @@ def load_timezone_config() -> dict:
             "include_market_status": True
         }
 
-def get_timezone_objects() -> Tuple[pytz.BaseTzInfo, pytz.BaseTzInfo]:
+@lru_cache(maxsize=1)
+def get_timezone_objects() -> Tuple[ZoneInfo, ZoneInfo]:
     """Get primary and secondary timezone objects from config"""
     config = load_timezone_config()
-    primary_tz = pytz.timezone(config["primary"])
-    secondary_tz = pytz.timezone(config["secondary"])
+    primary_tz = ZoneInfo(config["primary"])
+    secondary_tz = ZoneInfo(config["secondary"])
     return primary_tz, secondary_tz
 
+def reload_timezone_config() -> None:
+    """Drop the cached config and timezone objects so the next call re-reads config.json"""
+    load_timezone_config.cache_clear()
+    get_timezone_objects.cache_clear()
+
+# Market status indexed by (weekend << 2) | (before_open << 1) | after_close
+_STATUS_TABLE = (
+    "OPEN",                 # 0: weekday, in session
+    "AFTER-HOURS",          # 1: weekday, after close
+    "PRE-MARKET",           # 2: weekday, before open
+    "PRE-MARKET",           # 3: unreachable (open < close)
+    "CLOSED (Weekend)",     # 4-7: weekend regardless of time
+    "CLOSED (Weekend)",
+    "CLOSED (Weekend)",
+    "CLOSED (Weekend)",
+)
+_MARKET_OPEN_MINUTES = 9 * 60 + 30  # 9:30 AM
+_MARKET_CLOSE_MINUTES = 16 * 60     # 4:00 PM
+
 def get_market_status(now_ny: dt.datetime) -> str:
     """Determine current market status"""
     # Market is open Monday-Friday 9:30-16:00 ET
-    weekday = now_ny.weekday()  # 0=Monday, 6=Sunday
-    hour = now_ny.hour
-    minute = now_ny.minute
-    
-    if weekday >= 5:  # Saturday or Sunday
-        return "CLOSED (Weekend)"
-    
-    # Convert to minutes for easier comparison
-    current_time = hour * 60 + minute
-    market_open = 9 * 60 + 30  # 9:30 AM
-    market_close = 16 * 60     # 4:00 PM
-    
-    if current_time < market_open:
-        return "PRE-MARKET"
-    elif current_time >= market_close:
-        return "AFTER-HOURS"
-    else:
-        return "OPEN"
+    current_time = now_ny.hour * 60 + now_ny.minute
+    idx = ((now_ny.weekday() >= 5) << 2
+           | (current_time < _MARKET_OPEN_MINUTES) << 1
+           | (current_time >= _MARKET_CLOSE_MINUTES))
+    return _STATUS_TABLE[idx]
 
 def format_dual_timezone(timestamp: dt.datetime, 
                         include_market_status: bool = True,
@@ -85,7 +97,7 @@ def format_dual_timezone(timestamp: dt.datetime,
     if not config["show_dual_time"]:
         # Single timezone mode
         if timestamp.tzinfo is None:
-            timestamp = NY.localize(timestamp)
+            timestamp = timestamp.replace(tzinfo=NY)
         ny_time = timestamp.astimezone(NY)
         
         if format_type == "time_only":
@@ -97,20 +109,21 @@ def format_dual_timezone(timestamp: dt.datetime,
         else:
             return ny_time.strftime("%Y-%m-%d %H:%M:%S ET")
     
-    # Dual timezone mode
+    # Dual timezone mode; zones are resolved on first use so a bad config
+    # name fails here rather than when the module is imported
     primary_tz, secondary_tz = get_timezone_objects()
     
     # Ensure timestamp is timezone-aware
     if timestamp.tzinfo is None:
-        timestamp = primary_tz.localize(timestamp)
+        timestamp = timestamp.replace(tzinfo=primary_tz)
     
     # Convert to both timezones
     primary_time = timestamp.astimezone(primary_tz)
     secondary_time = timestamp.astimezone(secondary_tz)
     
     # Get timezone abbreviations
-    primary_abbr = primary_time.strftime("%Z")
-    secondary_abbr = secondary_time.strftime("%Z")
+    primary_abbr = primary_time.tzname()
+    secondary_abbr = secondary_time.tzname()
     
     # Format based on type
     if format_type == "time_only":
@@ -129,80 +142,143 @@ def format_dual_timezone(timestamp: dt.datetime,
     
     return result
 
-def format_current_time(format_type: str = "full", include_market_status: bool = True) -> str:
-    """Format current time with dual timezone display"""
-    now = dt.datetime.now(tz=NY)
+# strftime patterns shared by the scalar and Series formatters
+_FORMAT_PATTERNS = {
+    "time_only": "%H:%M:%S",
+    "date_only": "%Y-%m-%d",
+    "short": "%m/%d %H:%M",
+    "full": "%Y-%m-%d %H:%M:%S",
+}
+
+def _localize_like_replace(ts: "pd.Series", tz: ZoneInfo) -> "pd.Series":
+    """tz_localize a naive Series with the same DST resolution as datetime.replace(tzinfo=tz)"""
+    # replace() leaves fold=0: an ambiguous wall time is its first (DST) occurrence,
+    # which pandas spells as a True flag (NaT rows ignore theirs); plain
+    # tz_localize would raise instead
+    localized = ts.dt.tz_localize(tz, ambiguous=ts.notna().to_numpy(), nonexistent='NaT')
+    
+    # A wall time inside a spring-forward gap keeps the pre-transition offset under
+    # replace(); none of pandas' nonexistent options does that, so resolve the rare
+    # gap values one at a time exactly as the scalar formatter would
+    gap = localized.isna() & ts.notna()
+    if gap.any():
+        localized[gap] = ts[gap].map(lambda t: t.to_pydatetime().replace(tzinfo=tz))
+    return localized
+
+def format_dual_timezone_series(ts: "pd.Series", format_type: str = "full") -> "pd.Series":
+    """
+    Vectorized format_dual_timezone for a datetime64 Series (no market status)
+    
+    Use this instead of Series.apply(format_dual_timezone) when formatting
+    whole timestamp columns: conversion and formatting run once per column.
+    Naive timestamps are localized as in the scalar version: to NY in single
+    timezone mode, otherwise to the primary timezone.
+    
+    Returns:
+        Series of strings like "2025-08-19 14:30:15 EDT (2025-08-20 04:30:15 AEST)"
+    """
+    pattern = _FORMAT_PATTERNS.get(format_type, _FORMAT_PATTERNS["full"])
+    naive = ts.dt.tz is None
+    
+    if not load_timezone_config()["show_dual_time"]:
+        ny_time = _localize_like_replace(ts, NY) if naive else ts.dt.tz_convert(NY)
+        suffix = "" if format_type == "date_only" else " ET"
+        return ny_time.dt.strftime(pattern + suffix)
+    
+    primary_tz, secondary_tz = get_timezone_objects()
+    if naive:
+        ts = _localize_like_replace(ts, primary_tz)
+    
+    primary = ts.dt.tz_convert(primary_tz).dt.strftime(pattern + " %Z")
+    secondary = ts.dt.tz_convert(secondary_tz).dt.strftime(pattern + " %Z")
+    return primary + " (" + secondary + ")"
+
+def format_current_time(format_type: str = "full", include_market_status: bool = True,
+                        now: Optional[dt.datetime] = None) -> str:
+    """Format current time (or a shared `now` snapshot) with dual timezone display"""
+    if now is None:
+        now = dt.datetime.now(tz=NY)
     return format_dual_timezone(now, include_market_status, format_type)
 
-def get_timestamped_filename(base_name: str, extension: str = "html") -> str:
+def get_timestamped_filename(base_name: str, extension: str = "html",
+                             now: Optional[dt.datetime] = None) -> str:
     """
     Generate filename with timestamp
     
     Args:
         base_name: Base filename (e.g., "monday_plan", "position_monitor")
         extension: File extension without dot
+        now: Timestamp to use (default: current time); pass the same value
+             for every file in a batch so their names match
     
     Returns:
         Filename like "monday_plan_20250819_1430ET.html"
     """
-    now = dt.datetime.now(tz=NY)
+    now = dt.datetime.now(tz=NY) if now is None else now.astimezone(NY)
     timestamp = now.strftime("%Y%m%d_%H%M")
     return f"{base_name}_{timestamp}ET.{extension}"
 
-def get_next_market_event() -> Tuple[str, dt.datetime, str]:
+# Regular session hours, NY time
+MARKET_OPEN_TIME = dt.time(9, 30)
+MARKET_CLOSE_TIME = dt.time(16, 0)
+
+@lru_cache(maxsize=8)
+def _market_windows(day: dt.date) -> Tuple[dt.datetime, dt.datetime]:
+    """Regular-session (open, close) datetimes in NY time for a calendar date"""
+    return (dt.datetime.combine(day, MARKET_OPEN_TIME, tzinfo=NY),
+            dt.datetime.combine(day, MARKET_CLOSE_TIME, tzinfo=NY))
+
+def get_next_market_event(now: Optional[dt.datetime] = None) -> Tuple[str, dt.datetime, str]:
     """
     Get information about the next market open/close event
     
+    Args:
+        now: Reference time (default: current time); pass one snapshot when
+             calling several time helpers for the same report
+    
     Returns:
         Tuple of (event_type, event_time, dual_timezone_string)
     """
-    now_ny = dt.datetime.now(tz=NY)
+    now_ny = dt.datetime.now(tz=NY) if now is None else now.astimezone(NY)
+    today = now_ny.date()
     weekday = now_ny.weekday()
     
-    # Today's market times
-    today_open = now_ny.replace(hour=9, minute=30, second=0, microsecond=0)
-    today_close = now_ny.replace(hour=16, minute=0, second=0, microsecond=0)
-    
     if weekday >= 5:  # Weekend
         # Next Monday open
-        days_until_monday = (7 - weekday) % 7
-        if days_until_monday == 0:  # Sunday
-            days_until_monday = 1
-        next_monday = now_ny + dt.timedelta(days=days_until_monday)
-        next_open = next_monday.replace(hour=9, minute=30, second=0, microsecond=0)
+        days_until_monday = 7 - weekday
+        next_open, _ = _market_windows(today + dt.timedelta(days=days_until_monday))
         return ("Market Open", next_open, format_dual_timezone(next_open, False))
     
-    # Weekday
-    current_time = now_ny.hour * 60 + now_ny.minute
-    market_open_mins = 9 * 60 + 30
-    market_close_mins = 16 * 60
+    # Today's market times
+    today_open, today_close = _market_windows(today)
     
-    if current_time < market_open_mins:
+    if now_ny < today_open:
         # Before market open today
         return ("Market Open", today_open, format_dual_timezone(today_open, False))
-    elif current_time < market_close_mins:
+    elif now_ny < today_close:
         # Market is open, next event is close
         return ("Market Close", today_close, format_dual_timezone(today_close, False))
     else:
         # After market close, next event is tomorrow's open (or Monday if Friday)
-        if weekday == 4:  # Friday
-            next_monday = now_ny + dt.timedelta(days=3)
-            next_open = next_monday.replace(hour=9, minute=30, second=0, microsecond=0)
-        else:
-            tomorrow = now_ny + dt.timedelta(days=1)
-            next_open = tomorrow.replace(hour=9, minute=30, second=0, microsecond=0)
+        days_ahead = 3 if weekday == 4 else 1
+        next_open, _ = _market_windows(today + dt.timedelta(days=days_ahead))
         return ("Market Open", next_open, format_dual_timezone(next_open, False))
 
-def time_until_event(event_time: dt.datetime) -> str:
+def time_until_event(event_time: dt.datetime, now: Optional[dt.datetime] = None) -> str:
     """
     Calculate human-readable time until event
     
+    Args:
+        event_time: Event time (naive times are treated as NY time)
+        now: Reference time (default: current time)
+    
     Returns:
         String like "2h 15m" or "15m" or "3d 2h"
     """
-    now = dt.datetime.now(tz=NY)
+    if now is None:
+        now = dt.datetime.now(tz=NY)
     if event_time.tzinfo is None:
-        event_time = NY.localize(event_time)
+        event_time = event_time.replace(tzinfo=NY)
     else:
         event_time = event_time.astimezone(NY)
     
@@ -225,10 +301,12 @@ def time_until_event(event_time: dt.datetime) -> str:
     
     return " ".join(parts)
 
-def get_market_countdown() -> str:
+def get_market_countdown(now: Optional[dt.datetime] = None) -> str:
     """Get countdown to next market event with dual timezone display"""
-    event_type, event_time, event_time_str = get_next_market_event()
-    countdown = time_until_event(event_time)
+    if now is None:
+        now = dt.datetime.now(tz=NY)
+    event_type, event_time, event_time_str = get_next_market_event(now)
+    countdown = time_until_event(event_time, now)
     return f"Next {event_type}: {event_time_str} (in {countdown})"
 
 # Convenience functions for common use cases
@@ -7,8 +7,18 @@ No GUI hanging issues - direct access to all tools
 import sys
 import subprocess
 import os
+import importlib
+import importlib.util
 from pathlib import Path
 
+# Console tools run in-process so their imports (pandas, ib_insync, ...) stay
+# loaded between runs: menu choice -> (banner, module, entry point, args).
+# The Qt monitors keep their own interpreter since a process gets one QApplication.
+LAUNCHERS = {
+    '3': ("🔧 Fixing Pending Positions...", 'fix_pending_positions', 'main', (['--fix'],)),
+    '4': ("📈 Running Core Backtest Engine...", 'backtest_core', 'quick_test', ()),
+}
+
 def clear_screen():
     """Clear the console screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -57,21 +67,14 @@ def run_simple_monitor():
         print(f"❌ Error: {e}")
         input("Press Enter to continue...")
 
-def fix_pending_positions():
-    """Run pending positions fix"""
-    print("🔧 Fixing Pending Positions...")
-    try:
-        subprocess.run([sys.executable, "fix_pending_positions.py", "--fix"])
-    except Exception as e:
-        print(f"❌ Error: {e}")
-    input("Press Enter to continue...")
-
-def run_backtest():
-    """Run core backtest engine"""
-    print("📈 Running Core Backtest Engine...")
+def run_launcher(choice):
+    """Run a LAUNCHERS entry in this process; a crashing tool does not take the menu down"""
+    banner, modname, fn, args = LAUNCHERS[choice]
+    print(banner)
     try:
-        subprocess.run([sys.executable, "backtest_core.py"])
-    except Exception as e:
+        mod = importlib.import_module(modname)
+        getattr(mod, fn)(*args)
+    except (Exception, SystemExit) as e:
         print(f"❌ Error: {e}")
     input("Press Enter to continue...")
 
@@ -152,8 +155,12 @@ def show_system_status():
         'pending_sales.json'
     ]
     
+    # One directory listing instead of a stat() per name
+    with os.scandir('.') as it:
+        entries = {e.name: e for e in it}
+    
     for file in files_to_check:
-        if os.path.exists(file):
+        if file in entries:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} - MISSING")
@@ -161,7 +168,7 @@ def show_system_status():
     # Check directories
     dirs_to_check = ['data', 'reports', 'logs']
     for dir in dirs_to_check:
-        if os.path.exists(dir):
+        if dir in entries and entries[dir].is_dir():
             print(f"✅ {dir}/ directory")
         else:
             print(f"❌ {dir}/ directory - MISSING")
@@ -170,10 +177,10 @@ def show_system_status():
     packages = ['PyQt6', 'matplotlib', 'ib_insync', 'pandas', 'yfinance']
     print("\n📦 PYTHON PACKAGES:")
     for pkg in packages:
-        try:
-            __import__(pkg.lower().replace('-', '_'))
+        # find_spec only locates the module on sys.path, it does not import it
+        if importlib.util.find_spec(pkg.replace('-', '_')) is not None:
             print(f"✅ {pkg}")
-        except ImportError:
+        else:
             print(f"❌ {pkg} - NOT INSTALLED")
     
     input("\nPress Enter to continue...")
@@ -199,14 +206,12 @@ def main():
         try:
             choice = input("Select option (1-9): ").strip()
             
-            if choice == '1':
+            if choice in LAUNCHERS:
+                run_launcher(choice)
+            elif choice == '1':
                 run_professional_monitor()
             elif choice == '2':
                 run_simple_monitor()
-            elif choice == '3':
-                fix_pending_positions()
-            elif choice == '4':
-                run_backtest()
             elif choice == '5':
                 launch_full_gui()
             elif choice == '6':
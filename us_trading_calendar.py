@@ -1,21 +1,38 @@
 import datetime as dt
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Tuple
 import pytz
 import holidays
 
 NY = pytz.timezone("America/New_York")
 
+@lru_cache(maxsize=16)
+def _holiday_set(year: int) -> frozenset:
+    # US holidays for year-1..year+1, built once per year and reused
+    us_h = holidays.UnitedStates(years=range(year-1, year+2))
+    return frozenset(us_h.keys())
+
+@lru_cache(maxsize=16)
+def _trading_days(year: int) -> Tuple[dt.date, ...]:
+    # Sorted trading days for year-1..year+1, so lookups near a date are a binary search
+    us_h = _holiday_set(year)
+    d, end = dt.date(year-1, 1, 1), dt.date(year+1, 12, 31)
+    days = []
+    while d <= end:
+        if d.weekday() < 5 and d not in us_h:
+            days.append(d)
+        d += dt.timedelta(days=1)
+    return tuple(days)
+
 def is_us_trading_day(date_: dt.date) -> bool:
     # Monday-Friday and not a US holiday
-    if date_.weekday() >= 5:
-        return False
-    us_h = holidays.UnitedStates(years=range(date_.year-1, date_.year+2))
-    return date_ not in us_h
+    return date_.weekday() < 5 and date_ not in _holiday_set(date_.year)
 
 def next_us_trading_day(date_: dt.date) -> dt.date:
-    d = date_
-    while not is_us_trading_day(d):
-        d += dt.timedelta(days=1)
-    return d
+    # First trading day on or after date_
+    days = _trading_days(date_.year)
+    return days[bisect_left(days, date_)]
 
 def next_monday_trading_date(ref_dt: dt.datetime) -> dt.date:
     ref_dt = ref_dt.astimezone(NY)
@@ -31,9 +48,8 @@ def next_monday_trading_date(ref_dt: dt.datetime) -> dt.date:
 def friday_of_week(monday_date: dt.date) -> dt.date:
     # Friday; if holiday, step back to previous trading day in that week
     f = monday_date + dt.timedelta(days=4)
-    while not is_us_trading_day(f) or f.weekday() < 0 or f.weekday() > 4:
-        f -= dt.timedelta(days=1)
-    return f
+    days = _trading_days(monday_date.year)
+    return days[bisect_right(days, f) - 1]
 
 def ny_datetime(date_: dt.date, hour: int, minute: int) -> dt.datetime:
     return NY.localize(dt.datetime(date_.year, date_.month, date_.day, hour, minute))
@@ -12,29 +12,40 @@ Used across multiple reports for consistent VIX data access.
 
 import asyncio
 import logging
+import time
 from typing import Optional
 import yfinance as yf
 from ib_insync import IB, Index, Stock
 
 LOG = logging.getLogger(__name__)
 
-async def get_vix_data(ib: Optional[IB] = None) -> Optional[float]:
-    """
-    Get current VIX level using multiple data sources with fallback logic
-    
-    Args:
-        ib: Optional IBKR connection for fallback data source
-        
-    Returns:
-        VIX level as float, or None if all sources fail
-    """
-    vix_level = None
-    
-    # Method 1: Yahoo Finance intraday (most reliable)
+# Seconds a fetched VIX level is reused before going back to the data sources
+VIX_CACHE_TTL = 60
+
+_VIX_CACHE = {'ts': 0.0, 'val': None}
+_VIX_LOCK = None  # (event loop, asyncio.Lock) - a lock is only valid on its own loop
+
+def _cached_vix() -> Optional[float]:
+    """Cached VIX level if it is still fresh, else None"""
+    if _VIX_CACHE['val'] is not None and time.monotonic() - _VIX_CACHE['ts'] < VIX_CACHE_TTL:
+        return _VIX_CACHE['val']
+    return None
+
+def _get_vix_lock() -> asyncio.Lock:
+    """Lock that coalesces concurrent fetches on the running event loop"""
+    global _VIX_LOCK
+    loop = asyncio.get_running_loop()
+    if _VIX_LOCK is None or _VIX_LOCK[0] is not loop:
+        _VIX_LOCK = (loop, asyncio.Lock())
+    return _VIX_LOCK[1]
+
+async def _yahoo_intraday() -> Optional[float]:
+    """Method 1: Yahoo Finance intraday (most reliable)"""
     try:
         LOG.debug("Fetching VIX data from Yahoo Finance (intraday)...")
         vix_ticker = yf.Ticker('^VIX')
-        vix_info = vix_ticker.history(period='1d', interval='1m')
+        # yfinance is blocking HTTP; run it off the event loop so IB traffic keeps flowing
+        vix_info = await asyncio.to_thread(vix_ticker.history, period='1d', interval='1m')
         
         if not vix_info.empty:
             vix_level = float(vix_info['Close'].iloc[-1])
@@ -45,12 +56,14 @@ async def get_vix_data(ib: Optional[IB] = None) -> Optional[float]:
             
     except Exception as e:
         LOG.warning(f"Yahoo Finance VIX intraday fetch failed: {e}")
-    
-    # Method 2: Yahoo Finance daily data (reliable fallback)
+    return None
+
+async def _yahoo_daily() -> Optional[float]:
+    """Method 2: Yahoo Finance daily data (reliable fallback)"""
     try:
         LOG.debug("Fetching VIX daily data from Yahoo Finance...")
         vix_ticker = yf.Ticker('^VIX')
-        vix_daily = vix_ticker.history(period='2d')
+        vix_daily = await asyncio.to_thread(vix_ticker.history, period='2d')
         
         if not vix_daily.empty:
             vix_level = float(vix_daily['Close'].iloc[-1])
@@ -61,15 +74,19 @@ async def get_vix_data(ib: Optional[IB] = None) -> Optional[float]:
             
     except Exception as e:
         LOG.warning(f"Yahoo Finance daily VIX fetch failed: {e}")
-    
-    # Method 3: IBKR VIX Index (requires connection)
-    if ib and ib.isConnected():
+    return None
+
+async def _ibkr_index(ib: IB) -> Optional[float]:
+    """Method 3: IBKR VIX Index (requires connection)"""
+    vix_level = None
+    try:
+        LOG.debug("Fetching VIX data from IBKR...")
+        vix_contract = Index('VIX', 'CBOE', 'USD')
+        # qualifyContracts() would spin a nested loop; await the async variant instead
+        await ib.qualifyContractsAsync(vix_contract)
+        
+        vix_ticker = ib.reqMktData(vix_contract, '', False, False)
         try:
-            LOG.debug("Fetching VIX data from IBKR...")
-            vix_contract = Index('VIX', 'CBOE', 'USD')
-            ib.qualifyContracts(vix_contract)
-            
-            vix_ticker = ib.reqMktData(vix_contract, '', False, False)
             await asyncio.sleep(0.5)  # Give time for data
             
             # Try multiple price sources
@@ -79,41 +96,96 @@ async def get_vix_data(ib: Optional[IB] = None) -> Optional[float]:
                 vix_level = float(vix_ticker.close)
             elif hasattr(vix_ticker, 'marketPrice') and vix_ticker.marketPrice() and vix_ticker.marketPrice() > 0:
                 vix_level = float(vix_ticker.marketPrice())
-            
-            # Cancel market data
+        finally:
+            # Cancel market data (also when this source is cancelled early).
+            # cancelMktData only queues a message to TWS, so it does not block.
             ib.cancelMktData(vix_contract)
+        
+        if vix_level:
+            LOG.info(f"VIX from IBKR: {vix_level:.2f}")
+            return vix_level
+        else:
+            LOG.warning("No valid VIX price from IBKR")
             
-            if vix_level:
-                LOG.info(f"VIX from IBKR: {vix_level:.2f}")
-                return vix_level
-            else:
-                LOG.warning("No valid VIX price from IBKR")
-                
-        except Exception as e:
-            LOG.warning(f"IBKR VIX fetch failed: {e}")
+    except Exception as e:
+        LOG.warning(f"IBKR VIX fetch failed: {e}")
+    return None
+
+async def _ibkr_stock(ib: IB) -> Optional[float]:
+    """Method 4: IBKR VIX as Stock (legacy fallback)"""
+    try:
+        LOG.debug("Fetching VIX as stock from IBKR (legacy)...")
+        from .data_utils import hist_daily_closes  # Import here to avoid circular imports
+        
+        vix = Stock("VIX", "SMART", "USD")
+        vix_bars = await hist_daily_closes(ib, vix, days=3)
+        
+        if vix_bars:
+            vix_level = float(vix_bars[-1].close)
+            LOG.info(f"VIX from IBKR (stock): {vix_level:.2f}")
+            return vix_level
+        else:
+            LOG.warning("No VIX historical data from IBKR")
+            
+    except Exception as e:
+        LOG.warning(f"IBKR VIX stock fetch failed: {e}")
+    return None
+
+async def _fetch_vix_data(ib: Optional[IB] = None) -> Optional[float]:
+    """
+    Query all VIX sources, returning the first level in fallback order
     
-    # Method 4: IBKR VIX as Stock (legacy fallback)
+    All sources are queried concurrently, but the result still follows the
+    fallback order: the first source in priority order that returns a level
+    wins, and any sources still running are cancelled. Wall-clock time is the
+    latency of the winning source rather than the sum of the failed ones.
+    """
+    sources = [_yahoo_intraday(), _yahoo_daily()]
     if ib and ib.isConnected():
-        try:
-            LOG.debug("Fetching VIX as stock from IBKR (legacy)...")
-            from .data_utils import hist_daily_closes  # Import here to avoid circular imports
-            
-            vix = Stock("VIX", "SMART", "USD")
-            vix_bars = await hist_daily_closes(ib, vix, days=3)
-            
-            if vix_bars:
-                vix_level = float(vix_bars[-1].close)
-                LOG.info(f"VIX from IBKR (stock): {vix_level:.2f}")
+        sources += [_ibkr_index(ib), _ibkr_stock(ib)]
+    
+    tasks = [asyncio.ensure_future(source) for source in sources]
+    try:
+        for task in tasks:
+            vix_level = await task
+            if vix_level is not None:
                 return vix_level
-            else:
-                LOG.warning("No VIX historical data from IBKR")
-                
-        except Exception as e:
-            LOG.warning(f"IBKR VIX stock fetch failed: {e}")
+    finally:
+        for task in tasks:
+            task.cancel()
     
     LOG.error("All VIX data sources failed")
     return None
 
+async def get_vix_data(ib: Optional[IB] = None) -> Optional[float]:
+    """
+    Get current VIX level using multiple data sources with fallback logic
+    
+    Successful results are cached for VIX_CACHE_TTL seconds, and concurrent
+    callers share a single upstream fetch.
+    
+    Args:
+        ib: Optional IBKR connection for fallback data source
+        
+    Returns:
+        VIX level as float, or None if all sources fail
+    """
+    cached = _cached_vix()
+    if cached is not None:
+        return cached
+    
+    async with _get_vix_lock():
+        # Another caller may have refreshed the cache while we waited
+        cached = _cached_vix()
+        if cached is not None:
+            return cached
+        
+        vix_level = await _fetch_vix_data(ib)
+        if vix_level is not None:
+            _VIX_CACHE['ts'] = time.monotonic()
+            _VIX_CACHE['val'] = vix_level
+        return vix_level
+
 def check_vix_regime(vix_level: Optional[float], max_vix: Optional[float] = None) -> dict:
     """
     Check if VIX indicates favorable regime conditions
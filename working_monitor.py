@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 """
 Working Position Monitor - Simple and Reliable
-No threading, no complex event loops, just basic functionality that works
+No complex event loops, just basic functionality that works.
 """
 
 import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtGui import QBrush, QColor, QFont
 
 try:
     from ib_insync import IB, Stock, MarketOrder
@@ -15,6 +18,11 @@ try:
 except ImportError:
     IB_AVAILABLE = False
 
+from ib_pool import create_ib_pump
+
+# Order states that still count as working at the broker
+PENDING_STATUSES = frozenset(('Submitted', 'PreSubmitted', 'PendingSubmit', 'ApiPending'))
+
 # Import our pending sales tracker for automatic tracking
 try:
     from pending_sales import pending_tracker
@@ -22,6 +30,52 @@ try:
 except ImportError:
     PENDING_TRACKING_AVAILABLE = False
 
+# Table columns; ACTION_COL holds a button instead of an item
+ITEM_COLS = (0, 1, 2, 3, 4, 6)
+ACTION_COL = 5
+
+@dataclass
+class RowWidgets:
+    """The widgets of one position row, reused across refreshes"""
+    items: Dict[int, QTableWidgetItem]  # column -> item
+    button: QPushButton
+    selling: Optional[bool] = None  # None until the row is first styled
+
+def take_snapshot(ib) -> dict:
+    """Copy portfolio and pending orders out of ib_insync into plain dicts
+    
+    portfolio() and trades() only read ib_insync's client-side caches, so this is
+    cheap enough for the GUI thread, which is also the only thread touching them.
+    
+    Returns:
+        {'positions', 'sells', 'order_count'}
+    """
+    positions = {}
+    for item in ib.portfolio():
+        if item.position != 0:
+            positions[item.contract.symbol] = {
+                'qty': int(item.position),
+                'value': float(item.marketValue),
+                'pnl': float(item.unrealizedPNL)
+            }
+    
+    # Pending orders from the trade cache (no extra round-trips); orders placed
+    # by other clients are pulled in by Full Resync. Sells are bucketed by
+    # symbol once so each position is a single lookup
+    pending = [t for t in ib.trades() if t.orderStatus.status in PENDING_STATUSES]
+    sells_by_symbol = defaultdict(list)
+    for trade in pending:
+        if trade.order.action == 'SELL':
+            sells_by_symbol[trade.contract.symbol].append(
+                (int(trade.order.totalQuantity), trade.orderStatus.status)
+            )
+    
+    return {
+        'positions': positions,
+        'sells': dict(sells_by_symbol),
+        'order_count': len(pending)
+    }
+
 class WorkingMonitor(QDialog):
     """Simple, working position monitor"""
     
@@ -31,6 +85,20 @@ class WorkingMonitor(QDialog):
         self.setGeometry(200, 200, 1000, 600)  # Reasonable size
         
         self.ib = None
+        self._row_by_symbol: Dict[str, RowWidgets] = {}
+        
+        # Keeps the portfolio/order caches take_snapshot reads current while connected
+        self._ib_pump = create_ib_pump(self)
+        
+        self._brush_selling_bg = QBrush(QColor("#ffcccc"))
+        self._brush_selling_fg = QBrush(QColor("#cc0000"))
+        self._brush_green = QBrush(QColor("green"))
+        self._brush_red = QBrush(QColor("red"))
+        self._brush_none = QBrush()
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._normal_font = QFont()
+        
         self.init_ui()
         
     def init_ui(self):
@@ -76,6 +144,10 @@ class WorkingMonitor(QDialog):
         refresh_btn = QPushButton("Refresh")
         refresh_btn.clicked.connect(self.refresh_data)
         
+        resync_btn = QPushButton("Full Resync")
+        resync_btn.setToolTip("Re-download all open orders from TWS, including other clients' orders")
+        resync_btn.clicked.connect(self.full_resync)
+        
         close_all_btn = QPushButton("Close All Positions")
         close_all_btn.setStyleSheet("background-color: orange; color: white; font-weight: bold;")
         close_all_btn.clicked.connect(self.close_all)
@@ -84,6 +156,7 @@ class WorkingMonitor(QDialog):
         close_btn.clicked.connect(self.close)
         
         btn_layout.addWidget(refresh_btn)
+        btn_layout.addWidget(resync_btn)
         btn_layout.addWidget(close_all_btn)
         btn_layout.addStretch()
         btn_layout.addWidget(close_btn)
@@ -124,7 +197,8 @@ class WorkingMonitor(QDialog):
                 self.connect_btn.clicked.disconnect()
                 self.connect_btn.clicked.connect(self.disconnect_ibkr)
                 self.log_msg("Connected successfully")
-                self.refresh_data()
+                self._ib_pump.start()
+                self.full_resync()
             else:
                 self.log_msg("Connection failed")
                 
@@ -132,6 +206,7 @@ class WorkingMonitor(QDialog):
             self.log_msg(f"Connection error: {e}")
     
     def disconnect_ibkr(self):
+        self._ib_pump.stop()
         if self.ib and self.ib.isConnected():
             self.ib.disconnect()
         
@@ -142,118 +217,132 @@ class WorkingMonitor(QDialog):
         self.connect_btn.clicked.connect(self.connect_ibkr)
         self.log_msg("Disconnected")
     
+    def full_resync(self):
+        """Pull every open order from TWS into the trade cache, then refresh"""
+        if not self.ib or not self.ib.isConnected():
+            self.log_msg("Not connected")
+            return
+        
+        try:
+            orders = self.ib.reqAllOpenOrders()
+            self.log_msg(f"reqAllOpenOrders(): {len(orders)} orders")
+        except Exception as e:
+            self.log_msg(f"reqAllOpenOrders failed: {e}")
+        
+        self.refresh_data()
+    
     def refresh_data(self):
         if not self.ib or not self.ib.isConnected():
             self.log_msg("Not connected")
             return
-            
+        
+        self.log_msg("Getting positions and orders...")
         try:
-            self.log_msg("Getting positions and orders...")
-            
-            # Get positions
-            positions = {}
-            portfolio = self.ib.portfolio()
-            for item in portfolio:
-                if item.position != 0:
-                    positions[item.contract.symbol] = {
-                        'qty': int(item.position),
-                        'value': float(item.marketValue),
-                        'pnl': float(item.unrealizedPNL),
-                        'contract': item.contract
-                    }
-            
-            # Get ALL orders - try every method
-            all_orders = {}
-            
-            # Method 1: openOrders
-            orders1 = self.ib.openOrders()
-            self.log_msg(f"openOrders(): {len(orders1)} orders")
-            for order in orders1:
-                all_orders[order.order.orderId] = order
-            
-            # Method 2: reqAllOpenOrders
-            try:
-                orders2 = self.ib.reqAllOpenOrders()
-                self.log_msg(f"reqAllOpenOrders(): {len(orders2)} orders")
-                for order in orders2:
-                    all_orders[order.order.orderId] = order
-            except Exception as e:
-                self.log_msg(f"reqAllOpenOrders failed: {e}")
+            snapshot = take_snapshot(self.ib)
+        except Exception as e:
+            self.log_msg(f"Refresh error: {e}")
+            return
+        self._apply_snapshot(snapshot)
+    
+    def _apply_snapshot(self, snapshot):
+        """Rebuild the table from a take_snapshot() result"""
+        try:
+            positions = snapshot['positions']
+            sells_by_symbol = snapshot['sells']
+            self.log_msg(f"trades(): {snapshot['order_count']} pending")
             
-            # Method 3: trades
+            # Update table as one batch: no per-cell repaints, item signals or re-sorts
+            sorting = self.table.isSortingEnabled()
+            self.table.setUpdatesEnabled(False)
+            self.table.blockSignals(True)
+            self.table.setSortingEnabled(False)
             try:
-                trades = self.ib.trades()
-                pending = [t for t in trades if t.orderStatus.status in ['Submitted', 'PreSubmitted', 'PendingSubmit']]
-                self.log_msg(f"trades(): {len(pending)} pending")
-                for trade in pending:
-                    all_orders[trade.order.orderId] = trade
-            except Exception as e:
-                self.log_msg(f"trades() failed: {e}")
-            
-            # Update table
-            self.table.setRowCount(len(positions))
-            row = 0
-            
-            for symbol, pos in positions.items():
-                # Find pending sell orders for this symbol
-                pending_sells = []
-                for order_id, order_data in all_orders.items():
-                    if (order_data.contract.symbol == symbol and 
-                        order_data.order.action == 'SELL'):
-                        qty = int(order_data.order.totalQuantity)
-                        status = order_data.orderStatus.status
-                        pending_sells.append(f"{qty} shares ({status})")
-                
-                # Populate row
-                self.table.setItem(row, 0, QTableWidgetItem(symbol))
-                self.table.setItem(row, 1, QTableWidgetItem(str(pos['qty'])))
-                
-                # Pending sells - VERY VISIBLE
-                if pending_sells:
-                    pending_text = "; ".join(pending_sells)
-                    pending_item = QTableWidgetItem(f"SELLING: {pending_text}")
-                    pending_item.setBackground(QColor("#ffcccc"))
-                    pending_item.setForeground(QColor("#cc0000"))
-                    font = QFont()
-                    font.setBold(True)
-                    pending_item.setFont(font)
-                else:
-                    pending_item = QTableWidgetItem("None")
-                self.table.setItem(row, 2, pending_item)
-                
-                self.table.setItem(row, 3, QTableWidgetItem(f"${pos['value']:,.0f}"))
-                
-                # P&L with color
-                pnl_item = QTableWidgetItem(f"${pos['pnl']:,.0f}")
-                if pos['pnl'] >= 0:
-                    pnl_item.setForeground(QColor("green"))
-                else:
-                    pnl_item.setForeground(QColor("red"))
-                self.table.setItem(row, 4, pnl_item)
+                # Drop rows whose position is gone, bottom-up so row indices stay valid
+                gone = [symbol for symbol in self._row_by_symbol if symbol not in positions]
+                rows = [self.table.row(self._row_by_symbol.pop(symbol).items[0]) for symbol in gone]
+                for row in sorted(rows, reverse=True):
+                    self.table.removeRow(row)
                 
-                # Action button
-                if pending_sells:
-                    btn = QPushButton("Selling...")
-                    btn.setEnabled(False)
-                    btn.setStyleSheet("background-color: #ffcccc;")
-                else:
-                    btn = QPushButton("Close")
-                    btn.clicked.connect(lambda checked, s=symbol: self.close_position(s))
-                self.table.setCellWidget(row, 5, btn)
-                
-                # Status
-                if pending_sells:
-                    self.table.setItem(row, 6, QTableWidgetItem("PENDING SALE"))
-                else:
-                    self.table.setItem(row, 6, QTableWidgetItem("Open"))
-                
-                row += 1
+                for symbol, pos in positions.items():
+                    # Find pending sell orders for this symbol
+                    pending_sells = [f"{qty} shares ({status})" for qty, status in sells_by_symbol.get(symbol, ())]
+                    
+                    widgets = self._row_by_symbol.get(symbol)
+                    if widgets is None:
+                        widgets = self._row_by_symbol[symbol] = self._insert_row(symbol)
+                    self._update_row(widgets, pos, pending_sells)
+            finally:
+                self.table.setSortingEnabled(sorting)
+                self.table.blockSignals(False)
+                self.table.setUpdatesEnabled(True)
+                self.table.viewport().update()
             
-            self.log_msg(f"Updated: {len(positions)} positions, {len(all_orders)} orders total")
+            self.log_msg(f"Updated: {len(positions)} positions, {snapshot['order_count']} orders total")
             
         except Exception as e:
             self.log_msg(f"Refresh error: {e}")
     
+    def _insert_row(self, symbol):
+        """Append an empty row for a newly appeared position"""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        
+        items = {}
+        for col in ITEM_COLS:
+            items[col] = QTableWidgetItem()
+            self.table.setItem(row, col, items[col])
+        items[0].setText(symbol)
+        
+        btn = QPushButton()
+        btn.clicked.connect(lambda checked, s=symbol: self.close_position(s))
+        self.table.setCellWidget(row, ACTION_COL, btn)
+        
+        return RowWidgets(items, btn)
+    
+    @staticmethod
+    def _set_text(item, text):
+        """Set cell text only when it changed; returns whether it did"""
+        if item.text() == text:
+            return False
+        item.setText(text)
+        return True
+    
+    def _update_row(self, widgets, pos, pending_sells):
+        """Bring an existing row in line with the latest position, touching only what changed"""
+        items = widgets.items
+        self._set_text(items[1], str(pos['qty']))
+        self._set_text(items[3], f"${pos['value']:,.0f}")
+        
+        # P&L with color
+        if self._set_text(items[4], f"${pos['pnl']:,.0f}"):
+            items[4].setForeground(self._brush_green if pos['pnl'] >= 0 else self._brush_red)
+        
+        # Pending sells - VERY VISIBLE
+        self._set_text(items[2], f"SELLING: {'; '.join(pending_sells)}" if pending_sells else "None")
+        
+        selling = bool(pending_sells)
+        if selling == widgets.selling:
+            return
+        widgets.selling = selling
+        
+        btn = widgets.button
+        if selling:
+            items[2].setBackground(self._brush_selling_bg)
+            items[2].setForeground(self._brush_selling_fg)
+            items[2].setFont(self._bold_font)
+            btn.setText("Selling...")
+            btn.setEnabled(False)
+            btn.setStyleSheet("background-color: #ffcccc;")
+            items[6].setText("PENDING SALE")
+        else:
+            items[2].setBackground(self._brush_none)
+            items[2].setData(Qt.ItemDataRole.ForegroundRole, None)
+            items[2].setFont(self._normal_font)
+            btn.setText("Close")
+            btn.setEnabled(True)
+            btn.setStyleSheet("")
+            items[6].setText("Open")
+    
     def close_position(self, symbol):
         reply = QMessageBox.question(
             self, 'Close Position',
@@ -320,10 +409,12 @@ class WorkingMonitor(QDialog):
             except Exception as e:
                 self.log_msg(f"Error closing all: {e}")
     
-    def closeEvent(self, event):
+    def done(self, result):
+        # Every way out (close button, Esc, accept/reject) ends here, not just closeEvent
+        self._ib_pump.stop()
         if self.ib and self.ib.isConnected():
             self.ib.disconnect()
-        event.accept()
+        super().done(result)
 
 if __name__ == "__main__":
     app = QApplication([])
@@ -1,29 +1,255 @@
 #!/usr/bin/env python3
 """
 Working Position Monitor - Tested and Functional
+IB I/O runs on a worker thread so the dialog never blocks on the network
 """
 
+import asyncio
 import json
+import math
+import os
+import time
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer, QThread, QObject, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QFont, QTextCursor
 
 try:
-    from ib_insync import IB, Stock, MarketOrder
+    from ib_insync import IB, Contract, MarketOrder
     IB_AVAILABLE = True
 except ImportError:
     IB_AVAILABLE = False
 
+from ib_pool import create_ib_pump
+
+# Seconds to wait for TWS to acknowledge the orders placed by Close All
+ORDER_ACK_TIMEOUT = 10
+
+# Seconds a portfolio snapshot may be shown while a fresh one is fetched
+PORTFOLIO_CACHE_TTL = 30
+
+# One portfolio line; the bound format method is looked up once, not per row
+ROW_FMT = "  {sym}: {qty} shares, ${val:,.2f}, P&L: ${pnl:,.2f}".format
+
+# Background revalidation interval: doubles while the portfolio is unchanged, resets on change
+REFRESH_MIN_MS = 5000
+REFRESH_MAX_MS = 60000
+
+# ib_insync order states after which an order no longer shows as open
+DONE_STATUSES = frozenset(('Filled', 'Cancelled', 'ApiCancelled', 'Inactive'))
+
+# Order states shown under PENDING TRADES
+_PENDING_STATUSES = frozenset(('Submitted', 'PreSubmitted', 'PendingSubmit'))
+
+# Order states that mean TWS has not answered yet
+_UNACKED_STATUSES = frozenset(('PendingSubmit', 'ApiPending'))
+
+class IbWorker(QObject):
+    """Owns the IB client on its own thread; the dialog talks to it only through signals/slots"""
+    portfolio_ready = pyqtSignal(list)  # [PortfolioItem] with a nonzero position
+    orders_ready = pyqtSignal(list)  # [(order_id, action, qty, symbol, status)] for open trades
+    account_ready = pyqtSignal(str)
+    status_changed = pyqtSignal(str)  # 'connected' / 'disconnected'
+    log = pyqtSignal(str)
+    error = pyqtSignal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self.ib = None
+        self.account = "Unknown"
+        self._connected = False  # flipped by connect_ib and disconnectedEvent, never polled
+        self._loop = None
+        self._pump = None
+        self._refresh_pending = False
+        # Open trades keyed by identity (ib_insync updates each Trade in place), kept
+        # current by order events so a refresh never walks the session's full trade history
+        self._open_trades = {}
+    
+    @pyqtSlot()
+    def start(self):
+        """Runs on the worker thread once it starts: give it an asyncio loop for ib_insync"""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        # Created here so it pumps this thread's loop
+        self._pump = create_ib_pump(self)
+    
+    @pyqtSlot(str, int, int)
+    def connect_ib(self, host, port, client_id):
+        # Drop what is left of a connection TWS closed on us
+        self.disconnect_ib()
+        try:
+            self.ib = IB()
+            self.ib.connect(host, port, clientId=client_id, timeout=10)
+            
+            if not self.ib.isConnected():
+                self.error.emit("ERROR: Failed to connect")
+                return
+            
+            # The account list is fixed for the session: read it once here, never per refresh
+            self.account = (self.ib.managedAccounts() or ["Unknown"])[0]
+            self.account_ready.emit(self.account)
+            self._connected = True
+            self.ib.disconnectedEvent += self._on_disconnected
+            self.status_changed.emit('connected')
+            
+            # connect() already subscribed to account updates; follow deltas from here on
+            self._open_trades = {id(t): t for t in self.ib.openTrades()}
+            self.ib.updatePortfolioEvent += self._on_ib_update
+            self.ib.newOrderEvent += self._on_trade_update
+            self.ib.orderStatusEvent += self._on_trade_update
+            self.ib.execDetailsEvent += self._on_ib_update
+            self._pump.start()
+            
+            self.refresh()
+        except Exception as e:
+            self.error.emit(f"ERROR: Connection failed - {e}")
+    
+    @pyqtSlot()
+    def disconnect_ib(self):
+        if not self.ib:
+            return
+        
+        self.ib.updatePortfolioEvent -= self._on_ib_update
+        self.ib.newOrderEvent -= self._on_trade_update
+        self.ib.orderStatusEvent -= self._on_trade_update
+        self.ib.execDetailsEvent -= self._on_ib_update
+        self._open_trades = {}
+        if self._connected:
+            self.ib.disconnect()  # fires disconnectedEvent
+        self.ib.disconnectedEvent -= self._on_disconnected
+        self._on_disconnected()
+        self.ib = None
+    
+    def _on_disconnected(self):
+        """Connection closed, by us or by TWS: stop pumping and tell the dialog once"""
+        self._pump.stop()
+        if self._connected:
+            self._connected = False
+            self.status_changed.emit('disconnected')
+    
+    def _on_trade_update(self, trade):
+        if trade.orderStatus.status in DONE_STATUSES:
+            self._open_trades.pop(id(trade), None)
+        else:
+            self._open_trades[id(trade)] = trade
+        self._on_ib_update()
+    
+    def _on_ib_update(self, *args):
+        # Coalesce a burst of events (one per position on account updates) into one snapshot
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self.refresh)
+    
+    @pyqtSlot()
+    def refresh(self):
+        """Publish ib_insync's cached portfolio and orders; no requests are sent"""
+        self._refresh_pending = False
+        if not self._connected:
+            self.error.emit("ERROR: Not connected to IBKR")
+            return
+        
+        try:
+            # Flat instruments pile up in aged accounts; drop them once, before the
+            # dialog fingerprints, compares and formats the snapshot
+            self.portfolio_ready.emit([i for i in self.ib.portfolio() if i.position])
+            self.orders_ready.emit([
+                (t.order.orderId, t.order.action, t.order.totalQuantity, t.contract.symbol, t.orderStatus.status)
+                for t in self._open_trades.values()
+            ])
+        except Exception as e:
+            self.error.emit(f"ERROR refreshing data: {e}")
+    
+    @pyqtSlot(list)
+    def close_all(self, positions_to_close):
+        """Sell exactly the [(con_id, qty, symbol)] the user confirmed, not a newer portfolio"""
+        if not self._connected:
+            self.error.emit("ERROR: Not connected to IBKR")
+            return
+        
+        try:
+            # Portfolio contracts are already qualified; their conId plus SMART routing is a
+            # complete order contract, so no contract-details lookup is needed
+            # Place all market sell orders back to back; placeOrder only queues the message
+            trades = [
+                self.ib.placeOrder(Contract(conId=con_id, exchange='SMART'), MarketOrder('SELL', qty))
+                for con_id, qty, _ in positions_to_close
+            ]
+            
+            # Acknowledgements are awaited together on the worker's loop, which the pump drives
+            self._loop.create_task(self._report_close_all(positions_to_close, trades))
+            
+        except Exception as e:
+            self.error.emit(f"ERROR closing positions: {e}")
+    
+    @staticmethod
+    async def _acknowledged(trade):
+        while trade.orderStatus.status in _UNACKED_STATUSES:
+            await trade.statusEvent
+    
+    async def _report_close_all(self, positions_to_close, trades):
+        """Wait for TWS to answer every closing order at once (one round-trip, not N), then log them in order"""
+        try:
+            try:
+                await asyncio.wait_for(asyncio.gather(*map(self._acknowledged, trades)), ORDER_ACK_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass  # report whatever state the slow ones are in
+            
+            lines = [f"\nCLOSING {len(positions_to_close)} POSITIONS..."]
+            for (_, qty, symbol), trade in zip(positions_to_close, trades):
+                lines.append(
+                    f"  Placed SELL order: {qty} shares of {symbol}"
+                    f" ({trade.orderStatus.status})"
+                )
+            lines.append("ALL CLOSING ORDERS PLACED")
+            self.log.emit("\n".join(lines))
+            
+            # Refresh to show new orders
+            self.refresh()
+            
+        except Exception as e:
+            self.error.emit(f"ERROR closing positions: {e}")
+
 class WorkingPositionMonitor(QDialog):
     """Reliable position monitor that actually works"""
     
+    _STYLE_CONNECTED = "color: green; font-weight: bold; padding: 10px;"
+    _STYLE_DISCONNECTED = "color: red; font-weight: bold; padding: 10px;"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Position Monitor - Working Version")
         self.setGeometry(100, 100, 900, 600)
-        self.ib = None
+        self._connected = False
+        self._account = "Unknown"
+        self._portfolio_cache: list = []
+        self._cache_ts = 0.0
+        self._orders = []
+        self._render_pending = False
+        self._config_cache = None
+        self._config_mtime = 0
+        self._refresh_interval_ms = REFRESH_MIN_MS
+        self._last_hash = None  # fingerprint of the latest portfolio snapshot
+        self._last_fp = None  # fingerprint of what was last painted
+        self._section = None  # QTextCursor at the start of the snapshot section of the log
+        
         self.init_ui()
         
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._revalidate)
+        
+        # All IB I/O happens on the worker thread; results come back as queued signals
+        self._ib_thread = QThread(self)
+        self.worker = IbWorker()
+        self.worker.moveToThread(self._ib_thread)
+        self._ib_thread.started.connect(self.worker.start)
+        self.worker.portfolio_ready.connect(self._render_portfolio)
+        self.worker.orders_ready.connect(self._render_orders)
+        self.worker.account_ready.connect(self._set_account)
+        self.worker.status_changed.connect(self._on_status_changed)
+        self.worker.log.connect(self._log)
+        self.worker.error.connect(self._on_error)
+        self._ib_thread.start()
+        
     def init_ui(self):
         layout = QVBoxLayout(self)
         
@@ -54,9 +280,11 @@ class WorkingPositionMonitor(QDialog):
         layout.addLayout(conn_layout)
         
         # Data display
-        self.data_text = QTextEdit()
+        # Plain-text log: no rich-text layout per append, oldest lines dropped past the cap
+        self.data_text = QPlainTextEdit()
         self.data_text.setReadOnly(True)
         self.data_text.setMinimumHeight(350)
+        self.data_text.setMaximumBlockCount(5000)
         layout.addWidget(self.data_text)
         
         # Action buttons
@@ -83,169 +311,256 @@ class WorkingPositionMonitor(QDialog):
         layout.addWidget(close_btn)
         
     def load_config(self):
+        """Parsed config.json, re-read only when the file's mtime changes"""
         try:
+            mtime = os.stat("config.json").st_mtime
+            if mtime == self._config_mtime and self._config_cache:
+                return self._config_cache
+            
             with open("config.json", 'r') as f:
-                return json.load(f)
+                self._config_cache = json.load(f)
+            self._config_mtime = mtime
+            return self._config_cache
         except:
             return {"ib_host": "127.0.0.1", "ib_port": 7497, "ib_client_id": 7}
     
     def connect_ibkr(self):
         if not IB_AVAILABLE:
-            self.data_text.append("ERROR: ib-insync not installed. Run: pip install ib-insync")
+            self._log("ERROR: ib-insync not installed. Run: pip install ib-insync")
             return
             
+        config = self.load_config()
+        host = config.get("ib_host", "127.0.0.1")
+        port = int(config.get("ib_port", 7497))
+        client_id = int(config.get("ib_client_id", 7))
+        
+        self._log(f"Connecting to {host}:{port} with client ID {client_id}...")
+        self.connect_btn.setEnabled(False)
+        QMetaObject.invokeMethod(
+            self.worker, "connect_ib", Qt.ConnectionType.QueuedConnection,
+            Q_ARG(str, host), Q_ARG(int, port), Q_ARG(int, client_id)
+        )
+    
+    def disconnect_ibkr(self):
+        QMetaObject.invokeMethod(self.worker, "disconnect_ib", Qt.ConnectionType.QueuedConnection)
+    
+    def _on_status_changed(self, status):
+        self._connected = status == 'connected'
+        if self._connected:
+            self._last_fp = None
+            self._refresh_interval_ms = REFRESH_MIN_MS
+            self._refresh_timer.start(self._refresh_interval_ms)
+        else:
+            self._refresh_timer.stop()
+        
+        # Label and button changes land in a single repaint
+        self.setUpdatesEnabled(False)
         try:
-            config = self.load_config()
-            host = config.get("ib_host", "127.0.0.1")
-            port = int(config.get("ib_port", 7497))
-            client_id = int(config.get("ib_client_id", 7))
-            
-            self.data_text.append(f"Connecting to {host}:{port} with client ID {client_id}...")
-            
-            self.ib = IB()
-            self.ib.connect(host, port, clientId=client_id, timeout=10)
-            
-            if self.ib.isConnected():
+            if self._connected:
                 self.status_label.setText("✅ Connected")
-                self.status_label.setStyleSheet("color: green; font-weight: bold; padding: 10px;")
-                self.connect_btn.setEnabled(False)
-                self.disconnect_btn.setEnabled(True)
-                self.refresh_btn.setEnabled(True)
-                self.close_all_btn.setEnabled(True)
-                
-                self.data_text.append("SUCCESS: Connected to IBKR")
-                self.refresh_data()
+                self.status_label.setStyleSheet(self._STYLE_CONNECTED)
             else:
-                self.data_text.append("ERROR: Failed to connect")
-                
-        except Exception as e:
-            self.data_text.append(f"ERROR: Connection failed - {e}")
-    
-    def disconnect_ibkr(self):
-        if self.ib and self.ib.isConnected():
-            self.ib.disconnect()
+                self.status_label.setText("Disconnected")
+                self.status_label.setStyleSheet(self._STYLE_DISCONNECTED)
             
-        self.status_label.setText("Disconnected")
-        self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 10px;")
-        self.connect_btn.setEnabled(True)
-        self.disconnect_btn.setEnabled(False)
-        self.refresh_btn.setEnabled(False)
-        self.close_all_btn.setEnabled(False)
-        self.data_text.append("Disconnected from IBKR")
+            self.connect_btn.setEnabled(not self._connected)
+            self.disconnect_btn.setEnabled(self._connected)
+            self.refresh_btn.setEnabled(self._connected)
+            self.close_all_btn.setEnabled(self._connected)
+        finally:
+            self.setUpdatesEnabled(True)
+        
+        self._log("SUCCESS: Connected to IBKR" if self._connected else "Disconnected from IBKR")
+    
+    def _on_error(self, message):
+        self._log(message)
+        # A failed connect leaves us disconnected; allow another attempt
+        if not self._connected:
+            self.connect_btn.setEnabled(True)
+    
+    def _set_account(self, account):
+        self._account = account
+    
+    @staticmethod
+    def _fingerprint(portfolio):
+        return hash(tuple((i.contract.conId, i.position, i.marketValue, i.unrealizedPNL) for i in portfolio))
+    
+    def _render_portfolio(self, portfolio):
+        # Poll less often while nothing moves, back to the fast rate as soon as something does
+        h = self._fingerprint(portfolio)
+        changed = h != self._last_hash
+        if changed:
+            self._refresh_interval_ms = REFRESH_MIN_MS
+        else:
+            self._refresh_interval_ms = min(REFRESH_MAX_MS, self._refresh_interval_ms * 2)
+        self._last_hash = h
+        if self._connected:
+            self._refresh_timer.start(self._refresh_interval_ms)
+        
+        # Revalidation result: repaint only if it differs from what is on screen
+        self._cache_ts = time.monotonic()
+        self._portfolio_cache = portfolio
+        if changed:
+            self._schedule_render()
+    
+    def _render_orders(self, orders):
+        if orders != self._orders:
+            self._orders = orders
+            self._schedule_render()
+    
+    def _schedule_render(self):
+        """Portfolio and orders arrive as two signals; paint once for both"""
+        if not self._render_pending:
+            self._render_pending = True
+            QTimer.singleShot(0, self._render)
     
     def refresh_data(self):
-        if not self.ib or not self.ib.isConnected():
-            self.data_text.append("ERROR: Not connected to IBKR")
+        if not self._connected:
+            self._log("ERROR: Not connected to IBKR")
             return
-            
+        
+        # Stale-while-revalidate: show the last snapshot now, repaint if the worker finds changes
+        self._render_cached()
+        self._revalidate()
+    
+    def _revalidate(self):
+        """Ask the worker for a fresh snapshot; the adaptive timer lands here too"""
+        if self._connected:
+            QMetaObject.invokeMethod(self.worker, "refresh", Qt.ConnectionType.QueuedConnection)
+    
+    def _render_cached(self):
+        age = time.monotonic() - self._cache_ts
+        if age <= PORTFOLIO_CACHE_TTL:
+            self._render(f"CACHED DATA ({age:.0f}s old), REVALIDATING...", provisional=True)
+        # Whether the cache was shown or too old to show, the refresh in flight repaints
+        # even if unchanged, replacing the provisional title
+        self._last_hash = None
+    
+    def _render(self, title="REFRESHING DATA...", provisional=False):
+        """Paint the latest portfolio and order snapshots from the worker"""
+        self._render_pending = False
+        
+        if provisional:
+            # The cache is what is already on screen; paint it under the new title and
+            # leave the fingerprint unset so the revalidated snapshot always repaints
+            self._last_fp = None
+        else:
+            # Nothing moved since the last paint: skip all formatting and layout
+            fp = (self._last_hash, hash(tuple(self._orders)))
+            if fp == self._last_fp:
+                self._log("No changes since last refresh")
+                return
+            self._last_fp = fp
+        
         try:
-            self.data_text.append("\n" + "="*60)
-            self.data_text.append("REFRESHING DATA...")
-            self.data_text.append("="*60)
-            
-            # Get account info
-            account = self.ib.managedAccounts()[0] if self.ib.managedAccounts() else "Unknown"
-            self.data_text.append(f"Account: {account}")
-            
-            # Get positions
-            portfolio = self.ib.portfolio()
-            self.data_text.append(f"\nPORTFOLIO ({len(portfolio)} items):")
-            
-            total_value = 0
-            for item in portfolio:
-                if item.position != 0:
-                    symbol = item.contract.symbol
-                    qty = int(item.position)
-                    value = item.marketValue
-                    pnl = item.unrealizedPNL
-                    total_value += value
-                    
-                    self.data_text.append(f"  {symbol}: {qty} shares, ${value:,.2f}, P&L: ${pnl:,.2f}")
-            
-            self.data_text.append(f"\nTOTAL PORTFOLIO VALUE: ${total_value:,.2f}")
-            
-            # Get open orders
-            orders = self.ib.openOrders()
-            self.data_text.append(f"\nOPEN ORDERS ({len(orders)} found):")
+            # Build the whole block first so the document is laid out once per refresh
+            lines = ["\n" + "="*60, title, "="*60]
+            
+            lines.append(f"Account: {self._account}")
+            
+            # Active positions as of the latest snapshot (the worker drops flat ones)
+            active = self._portfolio_cache
+            lines.append(f"\nPORTFOLIO ({len(active)} items):")
+            
+            lines.extend(
+                ROW_FMT(sym=i.contract.symbol, qty=int(i.position), val=i.marketValue, pnl=i.unrealizedPNL)
+                for i in active
+            )
+            
+            # Compensated sum, so large accounts total to the cent
+            total_value = math.fsum(i.marketValue for i in active)
+            
+            lines.append(f"\nTOTAL PORTFOLIO VALUE: ${total_value:,.2f}")
+            
+            # Open orders
+            orders = self._orders
+            lines.append(f"\nOPEN ORDERS ({len(orders)} found):")
             
             if orders:
-                for order in orders:
-                    symbol = order.contract.symbol
-                    action = order.action
-                    qty = order.totalQuantity
-                    status = order.orderStatus.status
-                    order_id = order.order.orderId
-                    
-                    self.data_text.append(f"  Order {order_id}: {action} {qty} {symbol} ({status})")
+                for order_id, action, qty, symbol, status in orders:
+                    lines.append(f"  Order {order_id}: {action} {qty} {symbol} ({status})")
             else:
-                self.data_text.append("  No open orders found")
+                lines.append("  No open orders found")
             
-            # Get trades  
-            trades = self.ib.trades()
-            pending_trades = [t for t in trades if t.orderStatus.status in ['Submitted', 'PreSubmitted', 'PendingSubmit']]
-            self.data_text.append(f"\nPENDING TRADES ({len(pending_trades)} found):")
+            # Pending trades
+            pending_trades = [o for o in orders if o[4] in _PENDING_STATUSES]
+            lines.append(f"\nPENDING TRADES ({len(pending_trades)} found):")
             
             if pending_trades:
-                for trade in pending_trades:
-                    symbol = trade.contract.symbol
-                    action = trade.order.action
-                    qty = trade.order.totalQuantity
-                    status = trade.orderStatus.status
-                    
-                    self.data_text.append(f"  {action} {qty} {symbol} ({status})")
+                for order_id, action, qty, symbol, status in pending_trades:
+                    lines.append(f"  {action} {qty} {symbol} ({status})")
             else:
-                self.data_text.append("  No pending trades found")
+                lines.append("  No pending trades found")
                 
-            self.data_text.append("\nREFRESH COMPLETE")
+            lines.append("\nREFRESH COMPLETE")
+            self._replace_section("\n".join(lines))
             
         except Exception as e:
-            self.data_text.append(f"ERROR refreshing data: {e}")
+            self._log(f"ERROR refreshing data: {e}")
+    
+    def _log(self, message):
+        """Add a log line above the snapshot section, which always stays last"""
+        if self._section is None:
+            self.data_text.appendPlainText(message)
+            return
+        cursor = QTextCursor(self._section)
+        cursor.insertText("\n" + message)  # self._section moves past the inserted text
+    
+    def _replace_section(self, text):
+        """Swap the previous snapshot for the new one in a single edit, so the log holds
+        one snapshot instead of every refresh since connecting"""
+        if self._section is None:
+            self._section = QTextCursor(self.data_text.document())
+            self._section.movePosition(QTextCursor.MoveOperation.End)
+        
+        start = self._section.position()
+        cursor = QTextCursor(self._section)
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.insertText(text)
+        self._section.setPosition(start)
+        
+        self.data_text.setTextCursor(cursor)
+        self.data_text.ensureCursorVisible()
     
     def close_all_positions(self):
-        if not self.ib or not self.ib.isConnected():
-            self.data_text.append("ERROR: Not connected to IBKR")
+        if not self._connected:
+            self._log("ERROR: Not connected to IBKR")
+            return
+        
+        # The worker sells exactly what this dialog lists, so a position that changes
+        # between confirmation and placement is never sold at a quantity nobody saw
+        positions_to_close = [
+            (i.contract.conId, int(i.position), i.contract.symbol)
+            for i in self._portfolio_cache if i.position > 0
+        ]
+        if not positions_to_close:
+            self._log("No open long positions to close")
             return
             
         reply = QMessageBox.question(
             self, 'Close All Positions',
-            'This will place MARKET SELL orders for ALL positions.\n\nAre you sure?',
+            f'This will place MARKET SELL orders for {len(positions_to_close)} positions:\n'
+            f'{", ".join(f"{symbol} ({qty})" for _, qty, symbol in positions_to_close)}\n\nAre you sure?',
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply != QMessageBox.StandardButton.Yes:
             return
-            
-        try:
-            portfolio = self.ib.portfolio()
-            positions_to_close = [item for item in portfolio if item.position > 0]
-            
-            self.data_text.append(f"\nCLOSING {len(positions_to_close)} POSITIONS...")
-            
-            for item in positions_to_close:
-                symbol = item.contract.symbol
-                qty = int(item.position)
-                
-                # Create proper contract
-                contract = Stock(symbol, 'SMART', 'USD')
-                
-                # Place market sell order
-                order = MarketOrder('SELL', qty)
-                trade = self.ib.placeOrder(contract, order)
-                
-                self.data_text.append(f"  Placed SELL order: {qty} shares of {symbol}")
-                
-            self.data_text.append("ALL CLOSING ORDERS PLACED")
-            
-            # Refresh to show new orders
-            QTimer.singleShot(2000, self.refresh_data)
-            
-        except Exception as e:
-            self.data_text.append(f"ERROR closing positions: {e}")
+        
+        QMetaObject.invokeMethod(
+            self.worker, "close_all", Qt.ConnectionType.QueuedConnection, Q_ARG(list, positions_to_close)
+        )
     
-    def closeEvent(self, event):
-        if self.ib and self.ib.isConnected():
-            self.ib.disconnect()
-        event.accept()
+    def done(self, result):
+        # Every way out (close button, Esc, accept/reject) ends here; closeEvent misses Esc.
+        # Disconnect on the worker's thread, then stop it before the dialog goes away
+        self._refresh_timer.stop()
+        if self._ib_thread.isRunning():
+            QMetaObject.invokeMethod(self.worker, "disconnect_ib", Qt.ConnectionType.BlockingQueuedConnection)
+            self._ib_thread.quit()
+            self._ib_thread.wait()
+        super().done(result)
 
 if __name__ == "__main__":
     app = QApplication([])